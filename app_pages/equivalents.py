@@ -4,14 +4,15 @@ import polars as pl
 import streamlit as st
 
 from components import render_footer
+from utils.data import load_reference_table
 
 EQUIVALENTS_UPDATE_DATE = "2026-01-17"
 
 
 @st.cache_data(ttl=3600)
 def _load_equivalents() -> pl.DataFrame:
-    """Load equivalents CSV file (cached for 1 hour)."""
-    return pl.read_csv("app_pages/data/equivalents.csv")
+    """Load equivalents reference table (cached for 1 hour)."""
+    return load_reference_table("equivalents")
 
 
 st.markdown("# :material/equal: Equivalents")
@@ -1,5 +1,5 @@
-import hashlib
 from datetime import datetime
+from typing import Any
 
 import polars as pl
 import streamlit as st
@@ -36,34 +36,37 @@ CARD_ORDER_OPTIONS = [
     "Strategy Name - A to Z",
     "Strategy Name - Z to A",
 ]
-
-
-def _hash_filter_expression(filter_expr: pl.Expr) -> str:
-    """Create a stable hash for filter expression."""
-    # Convert expression to string representation for hashing
-    filter_str = str(filter_expr)
-    return hashlib.md5(filter_str.encode()).hexdigest()
+# Option -> selectbox index, so restoring the saved order is a single lookup
+CARD_ORDER_INDEX: dict[str, int] = {
+    option: idx for idx, option in enumerate(CARD_ORDER_OPTIONS)
+}
 
 
 @st.cache_data(max_entries=50)
 def filter_and_sort_strategies(
-    strats: pl.DataFrame, _filter_expr: pl.Expr, filter_hash: str
+    strats: pl.DataFrame, _filter_expr: pl.Expr, filter_key: tuple[Any, ...]
 ) -> pl.DataFrame:
     """Filter and sort the strategy table DataFrame.
 
-    Cached using filter_hash as part of the cache key to avoid re-filtering
+    Cached using filter_key as part of the cache key to avoid re-filtering
     when filters haven't changed.
 
     Args:
         strats: Strategy-level DataFrame (already collected, not LazyFrame)
         _filter_expr: Polars filter expression from sidebar (prefixed with _ to exclude from cache key)
-        filter_hash: Hash of the filter expression for cache key (computed in app.py)
+        filter_key: Canonical tuple of filter inputs from build_filter_expression()
     """
+    # Run filter + sort as one lazy query so the predicate is applied before the sort
     # Default sort prioritizes Investment Committee recommendations
-    return strats.filter(_filter_expr).sort(
-        by=["ic_recommend", "equity_allo", "strategy"],
-        descending=[True, True, False],
-        nulls_last=True,
+    return (
+        strats.lazy()
+        .filter(_filter_expr)
+        .sort(
+            by=["ic_recommend", "equity_allo", "strategy"],
+            descending=[True, True, False],
+            nulls_last=True,
+        )
+        .collect()
     )
 
 
@@ -84,21 +87,18 @@ card_order: str = get_or_init(CARD_ORDER_KEY, DEFAULT_CARD_ORDER)
 selected_order: str = st.selectbox(
     "Order By:",
     options=CARD_ORDER_OPTIONS,
-    index=CARD_ORDER_OPTIONS.index(card_order)
-    if card_order in CARD_ORDER_OPTIONS
-    else 0,
+    index=CARD_ORDER_INDEX.get(card_order, 0),
     key="card_order_by_select",
     on_change=lambda: st.session_state.update({CARDS_DISPLAYED_KEY: CARDS_PER_LOAD}),
 )
 st.session_state[CARD_ORDER_KEY] = selected_order
 
-filter_expr: pl.Expr = build_filter_expression()
-filter_hash: str = _hash_filter_expression(filter_expr)
+filter_expr, filter_key = build_filter_expression()
 filtered_strategies: pl.DataFrame = filter_and_sort_strategies(
-    strats, filter_expr, filter_hash
+    strats, filter_expr, filter_key
 )
 
-reset_if_changed("last_filter_hash", filter_hash, CARDS_DISPLAYED_KEY, CARDS_PER_LOAD)
+reset_if_changed("last_filter_key", filter_key, CARDS_DISPLAYED_KEY, CARDS_PER_LOAD)
 render_card_view(filtered_strategies)
 
 strategy_name: str | None = st.session_state.get(SELECTED_STRATEGY_MODAL_KEY)
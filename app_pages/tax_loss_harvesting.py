@@ -4,14 +4,15 @@ import polars as pl
 import streamlit as st
 
 from components import render_footer
+from utils.data import load_reference_table
 
 TLH_UPDATE_DATE = "2026-01-17"
 
 
 @st.cache_data(ttl=3600)
 def _load_tlh() -> pl.DataFrame:
-    """Load TLH CSV file (cached for 1 hour)."""
-    return pl.read_csv("app_pages/data/tlh.csv")
+    """Load TLH reference table (cached for 1 hour)."""
+    return load_reference_table("tlh")
 
 
 st.markdown("# :material/money_off: Tax-Loss Harvesting (TLH)")
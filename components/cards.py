@@ -18,6 +18,54 @@ CARDS_DISPLAYED_KEY = "cards_displayed"
 DEFAULT_CARD_ORDER = "Recommended (Default)"
 CARDS_PER_LOAD = 20
 
+# Mapping of sort order options to (column, descending) tuples; built once at
+# import instead of on every rerun. "Recommended (Default)" uses DEFAULT_SORT.
+SORT_CONFIGS: dict[str, tuple[str, bool]] = {
+    "Acct Min - Highest to Lowest": ("minimum", True),
+    "Acct Min - Lowest to Highest": ("minimum", False),
+    "Expense Ratio - Highest to Lowest": ("fee", True),
+    "Expense Ratio - Lowest to Highest": ("fee", False),
+    "Yield - High to Low": ("yield", True),
+    "Yield - Low to High": ("yield", False),
+    "Equity % - High to Low": ("equity_allo", True),
+    "Equity % - Low to High": ("equity_allo", False),
+    "Strategy Name - A to Z": ("strategy", False),
+    "Strategy Name - Z to A": ("strategy", True),
+}
+
+# Card width as an integer for st.container (e.g. "375px" -> 375)
+CARD_WIDTH_PX = int(CARD_FIXED_WIDTH.replace("px", ""))
+
+# CSS Grid layout for the card container; static, so formatted once at import.
+# Grid handles last-row alignment naturally without placeholder cards.
+# Streamlit adds 'st-key-' prefix to key-based classes.
+CARD_GRID_CSS = f"""
+<style>
+/* Convert flex container to CSS Grid for better last-row handling */
+.st-key-cards-flex-container {{
+    display: grid !important;
+    grid-template-columns: repeat(auto-fill, {CARD_FIXED_WIDTH}) !important;
+    justify-content: space-evenly !important;
+    gap: 10px !important;
+}}
+/* Ensure card containers don't override card border-radius */
+.st-key-cards-flex-container > div > div {{
+    border-radius: inherit !important;
+}}
+/* Ensure the card component itself maintains border-radius */
+.st-key-cards-flex-container .mc-card {{
+    border-radius: 12px !important;
+}}
+</style>
+"""
+
+# Default sort: Investment Committee recommendations prioritized, then by equity
+# allocation, then by strategy name (A to Z)
+DEFAULT_SORT: tuple[list[str], list[bool]] = (
+    ["ic_recommend", "equity_allo", "strategy"],
+    [True, True, False],
+)
+
 
 def _get_subtype_color(row: dict[str, Any]) -> str:
     """Get the color for a strategy based on its subtype from a row dict."""
@@ -100,32 +148,14 @@ def _render_cais_card(row: dict[str, Any], index: int) -> tuple[bool, str, str]:
 
 def _apply_sort_order(strategies: pl.DataFrame, sort_order: str) -> pl.DataFrame:
     """Apply sorting based on the selected order."""
-    # Mapping of sort order options to (column, descending) tuples
-    # Special case for "Recommended (Default)" uses multi-column sort
-    sort_configs: dict[str, tuple[list[str], list[bool]] | tuple[str, bool]] = {
-        "Acct Min - Highest to Lowest": ("minimum", True),
-        "Acct Min - Lowest to Highest": ("minimum", False),
-        "Expense Ratio - Highest to Lowest": ("fee", True),
-        "Expense Ratio - Lowest to Highest": ("fee", False),
-        "Yield - High to Low": ("yield", True),
-        "Yield - Low to High": ("yield", False),
-        "Equity % - High to Low": ("equity_allo", True),
-        "Equity % - Low to High": ("equity_allo", False),
-        "Strategy Name - A to Z": ("strategy", False),
-        "Strategy Name - Z to A": ("strategy", True),
-    }
-
-    # Default sort: Investment Committee recommendations prioritized, then by equity allocation, then by strategy name (A to Z)
-    default_sort = (["ic_recommend", "equity_allo", "strategy"], [True, True, False])
-
     # Get sort configuration
-    sort_config = sort_configs.get(sort_order)
+    sort_config = SORT_CONFIGS.get(sort_order)
 
-    if sort_config is None or sort_order == "Recommended (Default)":
+    if sort_config is None or sort_order == DEFAULT_CARD_ORDER:
         # Use default multi-column sort
         return strategies.sort(
-            by=default_sort[0],
-            descending=default_sort[1],
+            by=DEFAULT_SORT[0],
+            descending=DEFAULT_SORT[1],
             nulls_last=True,
         )
 
@@ -190,30 +220,7 @@ def render_card_view(
     card_rows: list[dict[str, Any]] = display_strategies.to_dicts()
 
     # Add CSS to use CSS Grid for automatic responsive card layout
-    # Grid handles last-row alignment naturally without placeholder cards
-    # Streamlit adds 'st-key-' prefix to key-based classes
-    st.markdown(
-        f"""
-        <style>
-        /* Convert flex container to CSS Grid for better last-row handling */
-        .st-key-cards-flex-container {{
-            display: grid !important;
-            grid-template-columns: repeat(auto-fill, {CARD_FIXED_WIDTH}) !important;
-            justify-content: space-evenly !important;
-            gap: 10px !important;
-        }}
-        /* Ensure card containers don't override card border-radius */
-        .st-key-cards-flex-container > div > div {{
-            border-radius: inherit !important;
-        }}
-        /* Ensure the card component itself maintains border-radius */
-        .st-key-cards-flex-container .mc-card {{
-            border-radius: 12px !important;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(CARD_GRID_CSS, unsafe_allow_html=True)
 
     # Use st.container with horizontal=True, then CSS overrides to Grid layout
     # Grid ensures last row stays left-aligned while other rows are evenly distributed
@@ -221,9 +228,7 @@ def render_card_view(
         # Render all cards sequentially, each wrapped in a fixed-width container
         for card_idx, row in enumerate(card_rows):
             # Wrap each card in a fixed-width container
-            # Convert "350px" to integer for width parameter
-            card_width_px = int(CARD_FIXED_WIDTH.replace("px", ""))
-            with st.container(width=card_width_px):
+            with st.container(width=CARD_WIDTH_PX):
                 # Detect CAIS rows by checking for non-null cais_type
                 is_cais = row.get("cais_type") is not None
                 if is_cais:
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Any
+
 import polars as pl
 import streamlit as st
 
@@ -17,6 +20,48 @@ TYPE_TO_SUBTYPE: dict[str, list[str]] = {
     ],
 }
 
+# Yes/No filters: (label, session state key, boolean column)
+BOOL_FILTERS: list[tuple[str, str, str]] = [
+    (":material/savings: Tax-Managed (TM)", "filter_tm", "has_tm"),
+    (":material/tune: SMA Manager", "filter_sma", "has_sma"),
+    (":material/key: Private Markets", "filter_pm", "has_private_market"),
+    (":material/eco: Values-Based", "filter_vbi", "has_VBI"),
+]
+
+# Conjunct ordering for the combined filter: cheap, selective equality-style
+# predicates first, range comparisons next, substring search last.
+_RANK_EQUALITY = 0
+_RANK_RANGE = 1
+_RANK_SEARCH = 2
+
+# Session state keys read when building the filter expression
+_FILTER_STATE_KEYS: tuple[str, ...] = (
+    "strategy_search_input",
+    "filter_ic",
+    "filter_tm",
+    "filter_sma",
+    "filter_pm",
+    "filter_vbi",
+    "min_strategy",
+    "filter_type",
+    "filter_subtype",
+    "equity_allocation_segmented",
+)
+
+# Session state keys read when rendering the type/subtype controls
+_TYPE_STATE_KEYS: tuple[str, ...] = (
+    "filter_type",
+    "filter_subtype",
+    "_previous_type",
+    "_previous_subtype",
+)
+
+
+def _snapshot_state(keys: tuple[str, ...]) -> dict[str, Any]:
+    """Read the given session state keys in one pass (missing keys map to None)."""
+    session_state = st.session_state
+    return {key: session_state.get(key) for key in keys}
+
 
 def _clear_search_state() -> None:
     """Clear search state."""
@@ -95,7 +140,7 @@ def render_filters() -> None:
 
         # Row 2
         st.space(1)
-        ic, tm, sma, pm, vbi, min = st.columns([6, 3, 3, 3, 3, 4])
+        ic, *yes_no_cols, min = st.columns([6, 3, 3, 3, 3, 4])
 
         with ic:
             st.segmented_control(
@@ -108,36 +153,12 @@ def render_filters() -> None:
                 ),
             )
 
-        with tm:
-            st.segmented_control(
-                label=":material/savings: Tax-Managed (TM)",
-                options=["Yes", "No"],
-                selection_mode="single",
-                key="filter_tm",
-            )
-
-        with sma:
-            st.segmented_control(
-                label=":material/tune: SMA Manager",
-                options=["Yes", "No"],
-                selection_mode="single",
-                key="filter_sma",
-            )
-
-        with pm:
-            st.segmented_control(
-                label=":material/key: Private Markets",
+        for col, (label, key, _) in zip(yes_no_cols, BOOL_FILTERS):
+            col.segmented_control(
+                label=label,
                 options=["Yes", "No"],
                 selection_mode="single",
-                key="filter_pm",
-            )
-
-        with vbi:
-            st.segmented_control(
-                label=":material/eco: Values-Based",
-                options=["Yes", "No"],
-                selection_mode="single",
-                key="filter_vbi",
+                key=key,
             )
 
         with min:
@@ -161,18 +182,20 @@ def render_filters() -> None:
                 key="filter_type",
             )
 
+        type_state: dict[str, Any] = _snapshot_state(_TYPE_STATE_KEYS)
+        selected_type: list[str] = type_state["filter_type"] or []
+        current_subtype: list[str] = type_state["filter_subtype"] or []
+
         # Equity Allocation segmented control (visible when Risk-Based is selected OR when Multifactor/Market/Income Series subtypes are selected)
         with equity:
-            filter_type = st.session_state.get("filter_type", [])
-            filter_subtype = st.session_state.get("filter_subtype", [])
             risk_based_subtypes = [
                 "Multifactor Series",
                 "Market Series",
                 "Income Series",
             ]
 
-            if "Risk-Based" in filter_type or any(
-                subtype in filter_subtype for subtype in risk_based_subtypes
+            if "Risk-Based" in selected_type or any(
+                subtype in current_subtype for subtype in risk_based_subtypes
             ):
                 equity_options = [f"{i}%" for i in range(0, 101, 10)]
                 st.segmented_control(
@@ -185,10 +208,8 @@ def render_filters() -> None:
                 st.empty()
 
         # Row 4
-        selected_type: list[str] = st.session_state.get("filter_type", [])
-        previous_type: list[str] = st.session_state.get("_previous_type", [])
-        current_subtype: list[str] = st.session_state.get("filter_subtype", [])
-        previous_subtype: list[str] = st.session_state.get("_previous_subtype", [])
+        previous_type: list[str] = type_state["_previous_type"] or []
+        previous_subtype: list[str] = type_state["_previous_subtype"] or []
 
         if not selected_type:
             # Show all subtypes when no types are selected
@@ -201,8 +222,7 @@ def render_filters() -> None:
         else:
             type_options: list[str] = []
             for st_type in selected_type:
-                if st_type in TYPE_TO_SUBTYPE:
-                    type_options.extend(TYPE_TO_SUBTYPE[st_type])
+                type_options.extend(TYPE_TO_SUBTYPE.get(st_type, ()))
 
         # Always sort with Multifactor Series, Market Series, Income Series first
         priority_subtypes = ["Multifactor Series", "Market Series", "Income Series"]
@@ -236,76 +256,66 @@ def render_filters() -> None:
         )
 
 
-def build_filter_expression() -> pl.Expr:
-    """Build filter expression from session state."""
+def _is_in_or_eq(expr: pl.Expr, values: list[Any]) -> pl.Expr:
+    """Match expr against values, using a scalar equality for a single value."""
+    if len(values) == 1:
+        return expr == values[0]
+    return expr.is_in(values)
 
-    expressions: list[pl.Expr] = []
 
-    # Search filter
-    strategy_search_text: str = st.session_state.get("strategy_search_input", "")
-    if strategy_search_text:
-        sanitized: str = strategy_search_text.strip()
-        if sanitized:
-            expressions.append(
-                pl.col("strategy")
-                .str.to_lowercase()
-                .str.contains(pattern=sanitized.lower(), literal=True)
-            )
+@lru_cache(maxsize=128)
+def _search_expression(needle: str) -> pl.Expr:
+    """Build the case-insensitive strategy name search expression (memoized per needle).
+
+    Streamlit reruns the page on every keystroke and widget interaction, so the
+    same search string is seen many times; reusing the expression object avoids
+    rebuilding it on each rerun.
+
+    Args:
+        needle: Search text, already stripped and lowercased
+    """
+    return (
+        pl.col("strategy").str.to_lowercase().str.contains(pattern=needle, literal=True)
+    )
+
+
+def _build_attribute_expressions(
+    state: dict[str, Any],
+) -> list[tuple[int, pl.Expr]]:
+    """Build (selectivity rank, expression) pairs for every non-search filter control.
+
+    Args:
+        state: Snapshot of the filter session state keys
+    """
+    expressions: list[tuple[int, pl.Expr]] = []
 
     # IC Status filter
-    recommended_selection: str = st.session_state["filter_ic"]
-    if recommended_selection == "Recommended":
-        expressions.append(pl.col("ic_recommend"))
-
-    # Tax-Managed filter
-    tax_managed_selection: str | None = st.session_state["filter_tm"]
-    if tax_managed_selection:
-        if tax_managed_selection == "Yes":
-            expressions.append(pl.col("has_tm"))
-        elif tax_managed_selection == "No":
-            expressions.append(~pl.col("has_tm"))
-
-    # Has SMA Manager filter
-    sma_selection: str | None = st.session_state["filter_sma"]
-    if sma_selection:
-        if sma_selection == "Yes":
-            expressions.append(pl.col("has_sma"))
-        elif sma_selection == "No":
-            expressions.append(~pl.col("has_sma"))
-
-    # Private Markets filter
-    private_markets_selection: str | None = st.session_state["filter_pm"]
-    if private_markets_selection:
-        if private_markets_selection == "Yes":
-            expressions.append(pl.col("has_private_market"))
-        elif private_markets_selection == "No":
-            expressions.append(~pl.col("has_private_market"))
-
-    # VBI filter
-    vbi_selection: str | None = st.session_state["filter_vbi"]
-    if vbi_selection:
-        if vbi_selection == "Yes":
-            expressions.append(pl.col("has_VBI"))
-        elif vbi_selection == "No":
-            expressions.append(~pl.col("has_VBI"))
+    if state["filter_ic"] == "Recommended":
+        expressions.append((_RANK_EQUALITY, pl.col("ic_recommend").eq(True)))
+
+    # Yes/No filters (Tax-Managed, SMA Manager, Private Markets, VBI)
+    for _, key, column in BOOL_FILTERS:
+        selection: str | None = state[key]
+        if selection == "Yes":
+            expressions.append((_RANK_EQUALITY, pl.col(column).eq(True)))
+        elif selection == "No":
+            expressions.append((_RANK_EQUALITY, pl.col(column).eq(False)))
 
     # Account Value filter
-    min_strategy: int | float | None = st.session_state["min_strategy"]
+    min_strategy: int | float | None = state["min_strategy"]
     if min_strategy is not None:
-        expressions.append(pl.col("minimum").le(min_strategy))
+        expressions.append((_RANK_RANGE, pl.col("minimum").le(min_strategy)))
 
     # Equity Allocation filter (only if Risk-Based is selected OR Multifactor/Market/Income Series subtypes are selected)
     # Combines equity allocation + alternative allocation (e.g., 65% equity + 15% alt = 80%)
-    filter_type = st.session_state.get("filter_type", [])
-    filter_subtype = st.session_state.get("filter_subtype", [])
+    filter_type: list[str] = state["filter_type"] or []
+    filter_subtype: list[str] = state["filter_subtype"] or []
     risk_based_subtypes = ["Multifactor Series", "Market Series", "Income Series"]
 
     if "Risk-Based" in filter_type or any(
         subtype in filter_subtype for subtype in risk_based_subtypes
     ):
-        equity_selections: list[str] = st.session_state.get(
-            "equity_allocation_segmented", []
-        )
+        equity_selections: list[str] = state["equity_allocation_segmented"] or []
         if equity_selections:
             # Convert selected percentages (e.g., "0%", "10%", "20%") to numeric values
             equity_values = [int(val.rstrip("%")) for val in equity_selections]
@@ -317,27 +327,72 @@ def build_filter_expression() -> pl.Expr:
                 )
                 / 10
             ).round(0) * 10
-            expressions.append(combined_allocation.is_in(equity_values))
+            expressions.append(
+                (_RANK_RANGE, _is_in_or_eq(combined_allocation, equity_values))
+            )
 
     # Type (multi-select) - Empty list means show all (none selected)
-    type_value: list[str] = st.session_state.get("filter_type", [])
-    if type_value:
+    if filter_type:
         # Case-insensitive comparison to handle any capitalization differences
-        type_value_lower = [v.lower() for v in type_value]
-        expressions.append(pl.col("ss_type").str.to_lowercase().is_in(type_value_lower))
+        type_value_lower = [v.lower() for v in filter_type]
+        expressions.append(
+            (
+                _RANK_EQUALITY,
+                _is_in_or_eq(pl.col("ss_type").str.to_lowercase(), type_value_lower),
+            )
+        )
 
     # Subtype - Empty list means show all (none selected)
-    subtype_value: list[str] = st.session_state.get("filter_subtype", [])
-    if subtype_value:
+    if filter_subtype:
         expressions.append(
-            pl.col("ss_subtype").is_in(subtype_value)
+            (_RANK_EQUALITY, _is_in_or_eq(pl.col("ss_subtype"), filter_subtype))
         )  # TODO: check when database is updated
 
-    # Combine all filter expressions with AND logic
+    return expressions
+
+
+def _build_filter_key(state: dict[str, Any], needle: str) -> tuple[Any, ...]:
+    """Build a canonical, hashable key describing the active filter inputs.
+
+    Lists are converted to tuples and the raw search text is replaced by its
+    normalized needle, so identical filter states always produce equal keys.
+    """
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for key, value in state.items()
+        if key != "strategy_search_input"
+    ) + (needle,)
+
+
+def build_filter_expression() -> tuple[pl.Expr, tuple[Any, ...]]:
+    """Build filter expression from session state.
+
+    The search box narrows the filtered set rather than replacing it, so the
+    search expression (when present) is AND-ed with the attribute filters.
+
+    The returned expression only references strategy-level columns, so callers
+    should apply it on a LazyFrame (``df.lazy().filter(expr)...collect()``) to
+    let Polars push the predicate down ahead of any sort or projection.
+
+    Returns:
+        Tuple of (filter expression, hashable filter key). The key is stable
+        across reruns for the same inputs and is meant to be used as the cache
+        key for the filtered result instead of the expression itself.
+    """
+    state: dict[str, Any] = _snapshot_state(_FILTER_STATE_KEYS)
+    expressions: list[tuple[int, pl.Expr]] = _build_attribute_expressions(state)
+
+    # Normalize the search text once; case-insensitive matching needs no other form
+    needle: str = (state["strategy_search_input"] or "").strip().lower()
+    if needle:
+        expressions.append((_RANK_SEARCH, _search_expression(needle)))
+
+    filter_key: tuple[Any, ...] = _build_filter_key(state, needle)
+
     if not expressions:
-        return pl.lit(True)
+        return pl.lit(True), filter_key
 
-    combined_expr = expressions[0]
-    for expr in expressions[1:]:
-        combined_expr = combined_expr & expr
-    return combined_expr
+    # Combine all filter expressions with AND logic as one flat conjunction,
+    # ordered so the cheapest/most selective predicates come first
+    expressions.sort(key=lambda ranked: ranked[0])
+    return pl.all_horizontal([expr for _, expr in expressions]), filter_key
@@ -57,15 +57,15 @@ def render_cais_modal(
         "Notes": row.get("notes", ""),
     }
 
-    # Display metrics in a two-column layout
+    # Display metrics in a two-column layout, one markdown block per column
+    metric_lines: list[str] = [
+        f"**{label}:** {value}" for label, value in metric_labels.items()
+    ]
+    split_idx: int = len(metric_lines) // 2 + len(metric_lines) % 2
     col1, col2 = st.columns(2)
 
     with col1:
-        for i, (label, value) in enumerate(metric_labels.items()):
-            if i < len(metric_labels) // 2 + len(metric_labels) % 2:
-                st.markdown(f"**{label}:** {value}")
+        st.markdown("\n\n".join(metric_lines[:split_idx]))
 
     with col2:
-        for i, (label, value) in enumerate(metric_labels.items()):
-            if i >= len(metric_labels) // 2 + len(metric_labels) % 2:
-                st.markdown(f"**{label}:** {value}")
+        st.markdown("\n\n".join(metric_lines[split_idx:]))
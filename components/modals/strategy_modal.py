@@ -6,8 +6,21 @@ import polars as pl
 import streamlit as st
 
 from components.tab_overview import render_allocation_tab
+from utils.data import hash_lazyframe
 from utils.models.base import _normalize_bool
 
+# Tabs shown in the strategy modal
+TAB_NAMES: list[str] = ["Overview"]
+
+# Allocation columns and their display labels, in display order
+ALLOCATION_COLUMNS: list[str] = [
+    "equity_allo",
+    "fixed_allo",
+    "private_allo",
+    "cash_allo",
+]
+ALLOCATION_LABELS: list[str] = ["Equity", "Fixed Income", "Alternative", "Cash"]
+
 
 def _generate_badges(row: dict[str, Any]) -> list[str]:
     """Generate badge strings for a strategy based on row data."""
@@ -39,41 +52,54 @@ def _generate_badges(row: dict[str, Any]) -> list[str]:
     return badges
 
 
-@st.dialog("Strategy Details", width="large", icon=":material/process_chart:")
-def render_strategy_modal(
-    strategy_name: str,
-    strategy_row: dict[str, Any],
-    strategy_color: str,
-    cleaned_data: pl.LazyFrame,
-) -> None:
-    """Render strategy details in a modal dialog."""
-    st.markdown(
-        f'<h1 style="color: {strategy_color}">{strategy_name}</h1>',
-        unsafe_allow_html=True,
-    )
+@st.cache_data(ttl=3600, hash_funcs={pl.LazyFrame: hash_lazyframe})
+def _get_allocations(
+    cleaned_data: pl.LazyFrame, strategy_name: str
+) -> dict[str, float]:
+    """Get a strategy's allocation percentages from the _allo columns (cached).
+
+    Args:
+        cleaned_data: Full cleaned data LazyFrame
+        strategy_name: Name of the strategy
 
-    # Get allocation percentages from _allo columns in the data
+    Returns:
+        Dict of allocation label -> percentage, empty if the strategy is not found
+    """
     normalized_strategy: str = strategy_name.strip().lower()
     allocation_row: pl.DataFrame = (
         cleaned_data.filter(
             pl.col("strategy").str.strip_chars().str.to_lowercase()
             == normalized_strategy
         )
-        .select(["equity_allo", "fixed_allo", "private_allo", "cash_allo"])
+        .select(ALLOCATION_COLUMNS)
         .first()
         .collect()
     )
 
-    # Extract allocation values and build display text
-    if allocation_row.height > 0:
-        allocations: dict[str, float] = {
-            "Equity": allocation_row["equity_allo"][0] or 0.0,
-            "Fixed Income": allocation_row["fixed_allo"][0] or 0.0,
-            "Alternative": allocation_row["private_allo"][0] or 0.0,
-            "Cash": allocation_row["cash_allo"][0] or 0.0,
-        }
-    else:
-        allocations = {}
+    if allocation_row.height == 0:
+        return {}
+
+    # Fetch all four values in one call instead of indexing each column
+    return {
+        label: value or 0.0
+        for label, value in zip(ALLOCATION_LABELS, allocation_row.row(0))
+    }
+
+
+@st.dialog("Strategy Details", width="large", icon=":material/process_chart:")
+def render_strategy_modal(
+    strategy_name: str,
+    strategy_row: dict[str, Any],
+    strategy_color: str,
+    cleaned_data: pl.LazyFrame,
+) -> None:
+    """Render strategy details in a modal dialog."""
+    # Header and exposure line go out as one markdown block
+    header_blocks: list[str] = [
+        f'<h1 style="color: {strategy_color}">{strategy_name}</h1>'
+    ]
+
+    allocations: dict[str, float] = _get_allocations(cleaned_data, strategy_name)
 
     # Build parts list for allocations > 0 (round instead of truncate)
     parts: list[str] = [
@@ -82,14 +108,17 @@ def render_strategy_modal(
 
     if parts:
         exposure_display_text: str = " - ".join(parts)
-        st.markdown(f"### {exposure_display_text}")
+        header_blocks.append(f"### {exposure_display_text}")
+
+    st.markdown("\n\n".join(header_blocks), unsafe_allow_html=True)
 
+    # Badges carry ss_type/ss_subtype values from the data, so they stay in
+    # their own markdown call without unsafe_allow_html
     badges: list[str] = _generate_badges(strategy_row)
     if badges:
         st.markdown(" &nbsp; ".join(badges) + " &nbsp;")
 
-    tab_names: list[str] = ["Overview"]
-    tabs: list[Any] = st.tabs(tab_names)
+    tabs: list[Any] = st.tabs(TAB_NAMES)
 
     with tabs[0]:  # Overview tab
         render_allocation_tab(strategy_name, cleaned_data)
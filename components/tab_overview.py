@@ -1,6 +1,7 @@
-import hashlib
-from dataclasses import dataclass
+import logging
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 import polars as pl
@@ -15,6 +16,8 @@ from utils.branding import (
 from utils.data import get_strategy_by_name, hash_lazyframe
 from utils.session_state import get_or_init
 
+logger = logging.getLogger(__name__)
+
 # Session state keys
 ALLOCATION_COLLAPSE_SMA_KEY = "allocation_collapse_sma"
 
@@ -26,8 +29,13 @@ SMA_COLLAPSE_THRESHOLD = 10
 # =============================================================================
 # FORMATTING UTILITIES
 # =============================================================================
+@lru_cache(maxsize=256)
 def _format_currency_compact(value: float | None) -> str:
-    """Format currency value with K (thousands) and M (millions) suffixes."""
+    """Format currency value with K (thousands) and M (millions) suffixes.
+
+    Account minimums repeat across equity columns and strategies, so results
+    are memoized.
+    """
     if value is None or value == 0:
         return "$0.0"
 
@@ -44,6 +52,32 @@ def _format_currency_compact(value: float | None) -> str:
         return f"{sign}${abs_value:.1f}"
 
 
+def _format_yield(x: Any) -> str:
+    """Format yield as percentage, or empty string if 0.0%."""
+    if x is None:
+        return ""
+    try:
+        val = float(x)
+        if val == 0.0:
+            return ""
+        return f"{val:.2%}"
+    except (ValueError, TypeError):
+        return ""
+
+
+def _format_account_min(x: Any) -> str:
+    """Format Account Minimum value as compact currency."""
+    if x is None:
+        raise ValueError(
+            "Account minimum value is None. ETL pipeline must ensure all account minimum values are non-null."
+        )
+    if x == "":
+        raise ValueError(
+            "Account minimum value is empty string. ETL pipeline must ensure all account minimum values are numeric."
+        )
+    return _format_currency_compact(float(x))
+
+
 # =============================================================================
 # TABLE STYLING
 # =============================================================================
@@ -99,9 +133,13 @@ class RowType(str, Enum):
     SUMMARY = "summary"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TableStyleConfig:
-    """Configuration for table styling."""
+    """Configuration for table styling.
+
+    The CSS rule strings are rendered once at construction so styling
+    passes reuse them instead of re-formatting per call.
+    """
 
     header_font: str = "Merriweather"
     body_font: str = "IBM Plex Sans"
@@ -111,6 +149,38 @@ class TableStyleConfig:
     product_indent: str = "20px"
     spacer_height: str = "4px"
     highlight_color: str = "#fff3cd"
+    header_css: str = field(init=False)
+    body_font_css: str = field(init=False)
+    product_css: str = field(init=False)
+    spacer_css: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "header_css",
+            f"font-family: '{self.header_font}', serif !important; "
+            f"padding: {self.header_padding} !important;",
+        )
+        object.__setattr__(
+            self,
+            "body_font_css",
+            f"font-family: '{self.body_font}', sans-serif !important;",
+        )
+        object.__setattr__(
+            self,
+            "product_css",
+            f"padding-left: {self.product_indent}; "
+            f"font-family: '{self.body_font}', sans-serif !important;",
+        )
+        object.__setattr__(
+            self,
+            "spacer_css",
+            f"height: {self.spacer_height}; line-height: {self.spacer_height};",
+        )
+
+
+# Shared styling config; frozen, so one instance serves every table render
+TABLE_STYLE_CONFIG = TableStyleConfig()
 
 
 @dataclass(frozen=True, slots=True)
@@ -186,31 +256,33 @@ def _apply_row_styling(
         return table
 
     if row_type == RowType.CATEGORY:
-        # Category rows: pastel background, bold text
+        # Category rows: pastel background, bold text.
+        # Rows sharing a color get a single tab_style record.
+        rows_by_color: dict[str | None, list[int]] = {}
         for idx in row_indices:
             row_color = row_colors.get(idx) if row_colors else None
-            rgba_color = hex_to_rgba(row_color, alpha=0.15) if row_color else None
+            rows_by_color.setdefault(row_color or None, []).append(idx)
+
+        for row_color, color_rows in rows_by_color.items():
             style_list = [
                 style.text(color="black", weight="bold"),
-                style.css(
-                    rule=f"font-family: '{config.body_font}', sans-serif !important;"
-                ),
+                style.css(rule=config.body_font_css),
             ]
-            if rgba_color:
-                style_list.insert(0, style.fill(color=rgba_color))
+            if row_color:
+                style_list.insert(
+                    0, style.fill(color=hex_to_rgba(row_color, alpha=0.15))
+                )
 
             table = table.tab_style(
                 style=style_list,
-                locations=loc.body(columns=pl.all(), rows=[idx]),
+                locations=loc.body(columns=pl.all(), rows=color_rows),
             )
 
     elif row_type == RowType.PRODUCT:
         # Product rows: indentation on asset column, font on all columns
         table = table.tab_style(
             style=[
-                style.css(
-                    rule=f"padding-left: {config.product_indent}; font-family: '{config.body_font}', sans-serif !important;"
-                ),
+                style.css(rule=config.product_css),
             ],
             locations=loc.body(columns=["asset_formatted"], rows=row_indices),
         )
@@ -218,9 +290,7 @@ def _apply_row_styling(
         if equity_cols:
             table = table.tab_style(
                 style=[
-                    style.css(
-                        rule=f"font-family: '{config.body_font}', sans-serif !important;"
-                    ),
+                    style.css(rule=config.body_font_css),
                 ],
                 locations=loc.body(columns=equity_cols, rows=row_indices),
             )
@@ -229,9 +299,7 @@ def _apply_row_styling(
         # Spacer rows: minimal height
         table = table.tab_style(
             style=[
-                style.css(
-                    rule=f"height: {config.spacer_height}; line-height: {config.spacer_height};"
-                ),
+                style.css(rule=config.spacer_css),
             ],
             locations=loc.body(columns=["asset_formatted"], rows=row_indices),
         )
@@ -240,9 +308,7 @@ def _apply_row_styling(
         # Summary rows: pastel background
         rgba_color = hex_to_rgba(strategy_color, alpha=0.15) if strategy_color else None
         style_list = [
-            style.css(
-                rule=f"font-family: '{config.body_font}', sans-serif !important;"
-            ),
+            style.css(rule=config.body_font_css),
         ]
         if rgba_color:
             style_list.insert(0, style.fill(color=rgba_color))
@@ -257,10 +323,9 @@ def _apply_row_styling(
 
 @st.cache_data(ttl=3600, hash_funcs={pl.LazyFrame: hash_lazyframe})
 def _get_model_data(cleaned_data: pl.LazyFrame, strategy_model: str) -> pl.DataFrame:
-    """Get and cache all data for a specific model."""
-    return (
-        cleaned_data.filter(pl.col("ss_suite") == strategy_model)
-        .select(
+    """Get and cache all data for a specific model, pre-processed in one collect."""
+    return _preprocess_product_data(
+        cleaned_data.filter(pl.col("ss_suite") == strategy_model).select(
             [
                 "strategy",
                 "portfolio",
@@ -276,299 +341,335 @@ def _get_model_data(cleaned_data: pl.LazyFrame, strategy_model: str) -> pl.DataF
                 "minimum",
             ]
         )
-        .collect()
-    )
+    ).collect()
 
 
-def _preprocess_product_data(all_model_data: pl.DataFrame) -> pl.DataFrame:
+def _preprocess_product_data(all_model_data: pl.LazyFrame) -> pl.LazyFrame:
     """Pre-process product data with vectorized operations.
 
+    Kept lazy so the derived columns are computed in the same plan as the
+    upstream filter/projection and materialized by a single collect.
+
     Args:
-        all_model_data: Raw model data DataFrame
+        all_model_data: Raw model data LazyFrame
 
     Returns:
-        DataFrame with product_cleaned and weight_float columns
+        LazyFrame with product_cleaned, weight_float and strategy_norm columns
     """
+    product: pl.Expr = pl.col("product").str.strip_chars()
     return all_model_data.with_columns(
         [
-            # Vectorized product name cleaning: remove trailing "ETF" (case-insensitive) and whitespace
-            pl.col("product")
-            .str.strip_chars()
-            .str.replace(r"(?i)ETF\s*$", "", literal=False)
-            .str.strip_chars()
+            # Vectorized product name cleaning: remove trailing "ETF" (case-insensitive)
+            # and whitespace. A literal suffix check plus head(-3) replaces the
+            # regex, so no regex engine runs over the column.
+            pl.when(product.str.to_uppercase().str.ends_with("ETF"))
+            .then(product.str.head(-3).str.strip_chars())
+            .otherwise(product)
             .alias("product_cleaned"),
+            # Kept in Float64: these feed two-decimal percent formatting, and
+            # single precision can flip rounding at half-basis-point values
             pl.col("weight").fill_null(0.0).cast(pl.Float64).alias("weight_float"),
+            # Normalize strategy names once so lookups are a plain equality
+            pl.col("strategy")
+            .str.strip_chars()
+            .str.to_lowercase()
+            .alias("strategy_norm"),
         ]
     )
 
 
-def _build_equity_to_strategy_lookup(
+def _collect_lookup_frames(
     all_model_data: pl.DataFrame,
-) -> tuple[dict[int, str], list[int]]:
-    """Build equity level to strategy name lookup.
+) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame, pl.DataFrame, frozenset[str]]:
+    """Collect the deduplicated frames behind the allocation lookups.
+
+    The projections share one input, so they are planned lazily and
+    executed together with ``pl.collect_all`` instead of separate eager passes.
 
     Args:
-        all_model_data: Model data DataFrame
+        all_model_data: Model data DataFrame (must have weight_float column)
 
     Returns:
-        Tuple of (equity_to_strategy dict, available_equity_levels list)
+        Tuple of (strategies, agg_targets, product_weights, model_agg_order,
+        collapsible_strategies)
     """
-    all_strategies: pl.DataFrame = (
-        all_model_data.select(["strategy", "portfolio"])
-        .unique()
-        .sort("portfolio", descending=True)
+    model_lf: pl.LazyFrame = all_model_data.lazy()
+    (
+        strategies,
+        agg_targets,
+        product_weights,
+        model_agg_order,
+        collapsible,
+    ) = pl.collect_all(
+        [
+            model_lf.select(["strategy", "portfolio"])
+            .unique()
+            .sort("portfolio", descending=True),
+            model_lf.select(["strategy", "model_agg", "agg_target"]).unique(
+                subset=["strategy", "model_agg"], keep="first"
+            ),
+            model_lf.select(
+                ["strategy", "model_agg", "product_cleaned", "ticker", "weight_float"]
+            ).unique(
+                subset=["strategy", "model_agg", "product_cleaned", "ticker"],
+                keep="first",
+            ),
+            # Unique model_aggs ordered by their pre-computed sort order from
+            # ETL; the row index becomes the block order in the final sort
+            model_lf.select(["model_agg", "for_order"])
+            .filter(pl.col("model_agg").is_not_null())
+            .unique()
+            .sort("for_order")
+            .with_row_index("ma_order")
+            .with_columns(
+                # Pre-process model agg names: remove "Portfolio" suffix
+                pl.col("model_agg")
+                .cast(pl.Utf8)
+                .str.replace_all(" Portfolio", "", literal=True)
+                .str.replace_all("Portfolio", "", literal=True)
+                .alias("model_agg_name")
+            )
+            # Distinct products per model_agg, for SMA collapse and spacer rows
+            .join(
+                model_lf.group_by("model_agg").agg(
+                    pl.struct(["product_cleaned", "ticker"])
+                    .n_unique()
+                    .alias("num_products")
+                ),
+                on="model_agg",
+                how="left",
+            ),
+            _collapsible_smas_query(model_lf),
+        ]
+    )
+    return (
+        strategies,
+        agg_targets,
+        product_weights,
+        model_agg_order,
+        frozenset(collapsible["strategy"].to_list()),
     )
 
-    equity_to_strategy: dict[int, str] = {
-        int(row["portfolio"]): row["strategy"] for row in all_strategies.to_dicts()
-    }
-
-    # Only show columns for equity levels that exist
-    available_equity_levels: list[int] = [
-        eq
-        for eq in [100, 90, 80, 70, 60, 50, 40, 30, 20, 10]
-        if eq in equity_to_strategy
-    ]
 
-    return equity_to_strategy, available_equity_levels
+# Equity levels shown as matrix columns, in display order
+EQUITY_LEVELS: list[int] = [100, 90, 80, 70, 60, 50, 40, 30, 20, 10]
 
 
-def _build_agg_target_lookup(
-    all_model_data: pl.DataFrame,
-) -> dict[tuple[str, str], float]:
-    """Build model aggregate target lookup.
+def _build_equity_levels(
+    all_strategies: pl.DataFrame,
+) -> tuple[list[int], list[str]]:
+    """Build the displayed equity levels and the strategy at each level.
 
     Args:
-        all_model_data: Model data DataFrame
+        all_strategies: Unique (strategy, portfolio) rows, sorted by portfolio
 
     Returns:
-        Dictionary mapping (strategy, model_agg) to target value
+        Tuple of (available_equity_levels, strategy_names) as parallel lists
     """
-    agg_target_lookup: dict[tuple[str, str], float] = {}
-    agg_target_data: pl.DataFrame = all_model_data.select(
-        ["strategy", "model_agg", "agg_target"]
-    ).unique(subset=["strategy", "model_agg"], keep="first")
-
-    for row in agg_target_data.to_dicts():
-        strat_name: str = row["strategy"]
-        model_agg_name: str = row["model_agg"]
-        agg_target: float = row["agg_target"]
-        if strat_name and model_agg_name is not None:
-            agg_target_lookup[(strat_name, str(model_agg_name))] = (
-                float(agg_target) if agg_target is not None else 0.0
-            )
+    # Only show columns for equity levels that exist
+    levels: pl.DataFrame = (
+        all_strategies.with_columns(pl.col("portfolio").cast(pl.Int64))
+        .filter(pl.col("portfolio").is_in(EQUITY_LEVELS))
+        .unique(subset="portfolio", keep="last", maintain_order=True)
+    )
 
-    return agg_target_lookup
+    return levels["portfolio"].to_list(), levels["strategy"].to_list()
 
 
-def _build_product_weight_lookup(
-    all_model_data: pl.DataFrame,
-) -> dict[tuple[str, str, str], float]:
-    """Build product weight lookup.
+def _build_category_matrix(
+    agg_target_data: pl.DataFrame,
+    equity_cols: list[str],
+    strategy_names: list[str],
+) -> pl.DataFrame:
+    """Pivot model aggregate targets into one column per equity level.
 
     Args:
-        all_model_data: Model data DataFrame (must have weight_float column)
+        agg_target_data: Unique (strategy, model_agg, agg_target) rows
+        equity_cols: Equity level column names, in display order
+        strategy_names: Strategy name at each equity level (parallel to equity_cols)
 
     Returns:
-        Dictionary mapping (strategy, model_agg, ticker) to weight value
+        DataFrame with model_agg plus one column per equity level
     """
-    product_weight_lookup: dict[tuple[str, str, str], float] = {}
-    product_weight_data: pl.DataFrame = all_model_data.select(
-        ["strategy", "model_agg", "ticker", "weight_float"]
-    ).unique(subset=["strategy", "model_agg", "ticker"], keep="first")
-
-    for row in product_weight_data.to_dicts():
-        strat: str = row["strategy"]
-        model_agg_val: str = str(row["model_agg"])
-        ticker_val: str = str(row["ticker"])
-        weight_val: float = row["weight_float"]
-        product_weight_lookup[(strat, model_agg_val, ticker_val)] = weight_val
-
-    return product_weight_lookup
+    # Model agg rows use agg_target (divide by 100 for display as percentage)
+    return agg_target_data.group_by("model_agg").agg(
+        [
+            (
+                pl.col("agg_target")
+                .filter(pl.col("strategy") == strategy_at_equity)
+                .first()
+                .fill_null(0.0)
+                / 100.0
+            ).alias(col)
+            for col, strategy_at_equity in zip(equity_cols, strategy_names)
+        ]
+    )
 
 
-def _build_model_agg_row(
-    model_agg: str | None,
-    model_agg_name: str,
-    available_equity_levels: list[int],
-    equity_to_strategy: dict[int, str],
-    agg_target_lookup: dict[tuple[str, str], float],
-    strategy_color: str,
-) -> tuple[dict[str, Any], RowMetadata]:
-    """Build a model aggregate category row.
+def _build_product_matrix(
+    product_weight_data: pl.LazyFrame,
+    equity_cols: list[str],
+    strategy_names: list[str],
+) -> pl.LazyFrame:
+    """Pivot product weights into one column per equity level.
 
     Args:
-        model_agg: Model aggregate name
-        model_agg_name: Cleaned model aggregate name
-        available_equity_levels: List of available equity percentages
-        equity_to_strategy: Equity to strategy mapping
-        agg_target_lookup: Aggregate target lookup
-        strategy_color: Strategy color for styling
+        product_weight_data: Unique (strategy, model_agg, product_cleaned, ticker,
+            weight_float) rows
+        equity_cols: Equity level column names, in display order
+        strategy_names: Strategy name at each equity level (parallel to equity_cols)
 
     Returns:
-        Tuple of (row_data dict, row_metadata dict)
+        LazyFrame with model_agg, product_cleaned, ticker, the max weight_float
+        across the model and one column per equity level, sorted by weight
     """
-    row_data: dict[str, Any] = {"asset": model_agg_name}
-    row_metadata = RowMetadata(
-        row_type=RowType.CATEGORY,
-        is_category=True,
-        name=model_agg_name,
-        color=strategy_color,
+    # Product allocations shown across all equity levels for comparison
+    return (
+        product_weight_data.group_by(["model_agg", "product_cleaned", "ticker"])
+        .agg(
+            [
+                pl.col("weight_float").max(),
+                *[
+                    pl.col("weight_float")
+                    .filter(pl.col("strategy") == strategy_at_equity)
+                    .first()
+                    .fill_null(0.0)
+                    .alias(col)
+                    for col, strategy_at_equity in zip(equity_cols, strategy_names)
+                ],
+            ]
+        )
+        .sort("weight_float", descending=True)
     )
 
-    # Model agg rows use agg_target (divide by 100 for display as percentage)
-    for eq_pct in available_equity_levels:
-        strategy_name_at_equity: str = equity_to_strategy[eq_pct]
-        strategy_model_agg_key: tuple[str, str] = (
-            strategy_name_at_equity,
-            str(model_agg),
-        )
-        agg_target_value: float = agg_target_lookup.get(strategy_model_agg_key, 0.0)
-        row_data[str(int(eq_pct))] = (
-            agg_target_value / 100.0
-        )  # Divide by 100 for percentage display
 
-    return row_data, row_metadata
+# Sort rank of each row kind within a model aggregate block
+_KIND_CATEGORY = 0
+_KIND_PRODUCT = 1
+_KIND_SPACER = 2
 
+_ROW_TYPE_BY_KIND: dict[int, RowType] = {
+    _KIND_CATEGORY: RowType.CATEGORY,
+    _KIND_PRODUCT: RowType.PRODUCT,
+    _KIND_SPACER: RowType.SPACER,
+}
+
+# Matrix columns that carry row metadata rather than display values
+_ROW_META_COLUMNS: list[str] = ["kind", "ticker", "collapsed"]
 
-def _build_product_rows(
-    products: pl.DataFrame,
-    model_agg: str | None,
-    available_equity_levels: list[int],
-    equity_to_strategy: dict[int, str],
-    product_weight_lookup: dict[tuple[str, str, str], float],
-    strategy_color: str,
-) -> tuple[list[dict[str, Any]], list[RowMetadata]]:
-    """Build product rows for a model aggregate.
+
+def _build_row_metadata(matrix: pl.DataFrame, strategy_color: str) -> list[RowMetadata]:
+    """Derive row metadata from the kind/asset/ticker columns of the matrix.
 
     Args:
-        products: Products DataFrame for the model aggregate
-        model_agg: Model aggregate name
-        available_equity_levels: List of available equity percentages
-        equity_to_strategy: Equity to strategy mapping
-        product_weight_lookup: Product weight lookup
+        matrix: Sorted allocation matrix with kind, asset and ticker columns
         strategy_color: Strategy color for styling
 
     Returns:
-        Tuple of (list of row_data dicts, list of row_metadata dicts)
+        List of RowMetadata, one per matrix row
     """
-    product_rows: list[dict[str, Any]] = []
-    product_metadata: list[RowMetadata] = []
-
-    for product_row in products.to_dicts():
-        product_name: str = product_row["product_cleaned"]
-        ticker: str = product_row["ticker"]
-
-        product_row_data: dict[str, Any] = {"asset": product_name}
-        product_metadata.append(
-            RowMetadata(
-                row_type=RowType.PRODUCT,
-                is_category=False,
-                name=product_name,
-                ticker=ticker,
-                color=strategy_color,
-            )
+    return [
+        RowMetadata(
+            row_type=_ROW_TYPE_BY_KIND[kind],
+            is_category=kind == _KIND_CATEGORY,
+            name=name,
+            color=strategy_color,
+            ticker=ticker,
+            is_spacer=kind == _KIND_SPACER,
         )
+        for kind, name, ticker in zip(
+            matrix["kind"].to_list(),
+            matrix["asset"].to_list(),
+            matrix["ticker"].to_list(),
+        )
+    ]
 
-        # Product allocations shown across all equity levels for comparison
-        for eq_pct in available_equity_levels:
-            strategy_name_at_equity: str = equity_to_strategy[eq_pct]
-            product_weight_key: tuple[str, str, str] = (
-                strategy_name_at_equity,
-                str(model_agg),
-                ticker,
-            )
-            product_row_data[str(int(eq_pct))] = product_weight_lookup.get(
-                product_weight_key, 0.0
-            )
-
-        product_rows.append(product_row_data)
-
-    return product_rows, product_metadata
 
+def _build_column_by_level(available_equity_levels: list[int]) -> dict[int, int]:
+    """Map each equity level to its table column index.
 
-def _build_spacer_row(
-    available_equity_levels: list[int],
-    strategy_color: str,
-) -> tuple[dict[str, Any], RowMetadata]:
-    """Build a spacer row.
+    Built once per model in the cached matrix build, so resolving the
+    highlighted column for a strategy is a single dict lookup.
 
     Args:
         available_equity_levels: List of available equity percentages
-        strategy_color: Strategy color for styling
 
     Returns:
-        Tuple of (row_data dict, row_metadata dict)
+        Dict of equity level -> column index (0-based, +1 for asset_formatted column)
     """
-    spacer_row: dict[str, Any] = {"asset": ""}
-    for eq_pct in available_equity_levels:
-        spacer_row[str(int(eq_pct))] = None
+    return {level: idx for idx, level in enumerate(available_equity_levels, start=1)}
 
-    spacer_metadata = RowMetadata(
-        row_type=RowType.SPACER,
-        is_category=False,
-        name="",
-        color=strategy_color,
-        is_spacer=True,
+
+def _collapsible_smas_query(model_lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Plan the lookup of strategies whose model aggregates exceed the collapse threshold.
+
+    Args:
+        model_lf: Pre-processed model data LazyFrame
+
+    Returns:
+        LazyFrame with the normalized (stripped, lowercased) strategy names
+        that have at least one collapsible model aggregate
+    """
+    return (
+        model_lf.select(
+            pl.col("strategy_norm").alias("strategy"), "model_agg", "product"
+        )
+        # Count products per strategy and model_agg
+        .group_by(["strategy", "model_agg"])
+        .agg(pl.count("product").alias("product_count"))
+        # Keep strategies where any model_agg has more products than the threshold
+        .filter(pl.col("product_count") > SMA_COLLAPSE_THRESHOLD)
+        .select("strategy")
+        .unique()
     )
 
-    return spacer_row, spacer_metadata
 
+def _frame_fingerprint(df: pl.DataFrame, *extras: str) -> str:
+    """Build a cache key from a DataFrame's row hashes plus extra key parts.
 
-def _calculate_highlighted_column(
-    strategy_equity_pct: int | None,
-    available_equity_levels: list[int],
-) -> int:
-    """Calculate highlighted column index.
+    Uses Polars' native ``hash_rows`` instead of serializing the frame to
+    JSON and running it through md5. The row index is hashed with each row,
+    so the same rows in a different order produce a different key.
 
     Args:
-        strategy_equity_pct: Strategy equity percentage
-        available_equity_levels: List of available equity percentages
+        df: DataFrame whose contents identify the table
+        *extras: Additional strings that affect the rendered output
 
     Returns:
-        Column index (0-based, +1 for asset_formatted column)
+        Fingerprint string
     """
-    if (
-        strategy_equity_pct is not None
-        and strategy_equity_pct in available_equity_levels
-    ):
-        return available_equity_levels.index(strategy_equity_pct) + 1
-    return 0
+    return "|".join(
+        [
+            str(df.columns),
+            str(df.with_row_index().hash_rows(seed=0).sum()),
+            str(df.height),
+            *extras,
+        ]
+    )
 
 
-def _has_collapsible_smas(all_model_data: pl.DataFrame, strategy_name: str) -> bool:
-    """Check if there are any model aggregates with products exceeding the collapse threshold."""
-    if all_model_data.height == 0:
-        return False
+def _metadata_fingerprint(row_metadata: list[RowMetadata]) -> str:
+    """Build a cache key part from the kind and color of every row.
 
-    normalized_strategy = strategy_name.strip().lower()
-    selected_strategy_data = all_model_data.filter(
-        pl.col("strategy").str.strip_chars().str.to_lowercase() == normalized_strategy
-    )
-    if selected_strategy_data.height == 0:
-        return False
+    Row kind and color drive the row styling, so they must be part of the
+    key for any cached HTML built from the metadata.
 
-    # Count products per model_agg
-    product_counts = selected_strategy_data.group_by("model_agg").agg(
-        pl.count("product").alias("product_count")
-    )
+    Args:
+        row_metadata: Row metadata list, in table order
 
-    # Check if any model_agg has more products than the threshold
-    return (
-        product_counts.filter(pl.col("product_count") > SMA_COLLAPSE_THRESHOLD).height
-        > 0
-    )
+    Returns:
+        Fingerprint string
+    """
+    return str(hash(tuple((meta.row_type.value, meta.color) for meta in row_metadata)))
 
 
-@st.cache_data(max_entries=100)
-def _generate_allocation_table_html_cached(
-    table_html: str, table_data_hash: str
-) -> str:
-    """Generate cached allocation table HTML.
+def _wrap_allocation_table_html(table_html: str) -> str:
+    """Wrap Great Tables HTML with the allocation table container and CSS.
+
+    Only called from the cached table builders, so it is not cached itself.
 
     Args:
         table_html: The HTML string from Great Tables (already generated)
-        table_data_hash: Hash of the table data for cache key
 
     Returns:
         Complete HTML string for the table
@@ -586,144 +687,215 @@ def _generate_allocation_table_html_cached(
     """
 
 
+def _build_model_lookups(
+    all_model_data: pl.DataFrame,
+) -> tuple[
+    list[int], list[str], pl.DataFrame, pl.DataFrame, pl.DataFrame, frozenset[str]
+]:
+    """Build the model-level lookups shared by every strategy in a model.
+
+    Not cached itself: its only caller, _get_equity_matrix_data, is already
+    cached per suite.
+
+    Args:
+        all_model_data: Pre-processed model data (product_cleaned, weight_float)
+
+    Returns:
+        Tuple of (available_equity_levels, strategy_names, category_matrix,
+        product_weight_data, model_agg_order, collapsible_strategies)
+    """
+    (
+        all_strategies,
+        agg_target_data,
+        product_weight_data,
+        model_agg_order,
+        collapsible_strategies,
+    ) = _collect_lookup_frames(all_model_data)
+    available_equity_levels, strategy_names = _build_equity_levels(all_strategies)
+    category_matrix: pl.DataFrame = _build_category_matrix(
+        agg_target_data, [str(eq) for eq in available_equity_levels], strategy_names
+    )
+    return (
+        available_equity_levels,
+        strategy_names,
+        category_matrix,
+        product_weight_data,
+        model_agg_order,
+        collapsible_strategies,
+    )
+
+
 @st.cache_data(ttl=3600, hash_funcs={pl.LazyFrame: hash_lazyframe})
 def _get_equity_matrix_data(
     cleaned_data: pl.LazyFrame,
-    strategy_name: str,
-    strategy_equity_pct: int | None,
-    collapse_sma: bool = DEFAULT_COLLAPSE_SMA,
-) -> tuple[pl.DataFrame, int, list[RowMetadata], dict[int, str]]:
+    strategy_suite: str,
+) -> tuple[
+    pl.DataFrame,
+    dict[int, str],
+    dict[int, int],
+    frozenset[str],
+    dict[str, dict[str, float]],
+]:
     """Get allocation data in matrix format with equity % columns.
 
+    Row metadata is returned column-wise (``kind`` and ``ticker`` columns on
+    the matrix) rather than as a list of RowMetadata objects, so the cached
+    value is a single Arrow-backed frame plus plain lookups.
+    Use _prepare_allocation_matrix to derive the RowMetadata list.
+
+    The matrix only depends on the model, so it is cached per suite and shared
+    by every strategy in it. The per-strategy parts (highlighted column and
+    whether the strategy has collapsible SMAs) are resolved by
+    _prepare_allocation_matrix from the returned lookups.
+
+    The full (uncollapsed) matrix is cached once per model. Product rows of
+    collapsible SMAs are flagged in the ``collapsed`` column and dropped by
+    _prepare_allocation_matrix, so toggling the collapse checkbox filters the
+    cached frame instead of rebuilding it.
+
     Steps:
-    1. Load strategy data and get model information
-    2. Pre-process data with vectorized operations
-    3. Build lookup dictionaries for efficient data access
-    4. Iterate over model aggregates to build matrix rows
-    5. Add product rows and spacer rows as needed
-    6. Calculate highlighted column index
+    1. Load the cached model data and build the model-level lookups
+    2. Build the product matrix
+    3. Interleave category, product and spacer rows with one concat + sort
+    4. Compute the summary metrics for every equity level
+
+    Args:
+        cleaned_data: Full cleaned data LazyFrame
+        strategy_suite: Model (ss_suite) of the strategy
+
+    Returns:
+        Tuple of (matrix_df, equity_to_strategy, column_by_level,
+        collapsible_strategies, summary_metrics_lookup)
     """
     # ============================================================================
-    # STEP 1: Load strategy data and get model information
+    # STEP 1: Load model data and build model-level lookups
     # ============================================================================
-    strategy_data: dict[str, Any] | None = get_strategy_by_name(
-        cleaned_data, strategy_name, cache_version=3
-    )
-    strategy_suite: str = strategy_data.get("ss_suite", "")
-    subtype_val: str = strategy_data.get("ss_subtype", "")
-    strategy_color: str = get_subtype_color(subtype_val)
-
+    # Model data arrives pre-processed (product_cleaned, weight_float)
     all_model_data: pl.DataFrame = _get_model_data(cleaned_data, strategy_suite)
+    (
+        available_equity_levels,
+        strategy_names,
+        category_matrix,
+        product_weight_data,
+        model_agg_order,
+        collapsible_strategies,
+    ) = _build_model_lookups(all_model_data)
+    equity_cols: list[str] = [str(eq) for eq in available_equity_levels]
+    equity_to_strategy: dict[int, str] = dict(
+        zip(available_equity_levels, strategy_names)
+    )
+    column_by_level: dict[int, int] = _build_column_by_level(available_equity_levels)
 
     # ============================================================================
-    # STEP 2: Pre-process data with vectorized operations
+    # STEP 2: Build the product matrix
     # ============================================================================
-    all_model_data = _preprocess_product_data(all_model_data)
+    # Steps 2 and 3 are planned lazily and materialized by a single collect,
+    # so Polars fuses the joins and runs the row-kind branches together
+    order_lf: pl.LazyFrame = model_agg_order.lazy()
+    product_matrix: pl.LazyFrame = _build_product_matrix(
+        product_weight_data.lazy(), equity_cols, strategy_names
+    )
+    last_ma_order: int = model_agg_order.height - 1
 
     # ============================================================================
-    # STEP 3: Build lookup dictionaries for efficient data access
+    # STEP 3: Interleave category, product and spacer rows
     # ============================================================================
-    equity_to_strategy, available_equity_levels = _build_equity_to_strategy_lookup(
-        all_model_data
+    category_frame: pl.LazyFrame = order_lf.join(
+        category_matrix.lazy(), on="model_agg", how="left"
+    ).select(
+        [
+            "ma_order",
+            pl.lit(_KIND_CATEGORY).alias("kind"),
+            pl.lit(0, dtype=pl.UInt32).alias("rank"),
+            pl.col("model_agg_name").alias("asset"),
+            pl.lit(None, dtype=pl.Utf8).alias("ticker"),
+            pl.lit(False).alias("collapsed"),
+            *equity_cols,
+        ]
     )
-    agg_target_lookup = _build_agg_target_lookup(all_model_data)
-    product_weight_lookup = _build_product_weight_lookup(all_model_data)
 
-    # Get unique model_aggs with their pre-computed sort order from ETL
-    model_agg_order: pl.DataFrame = (
-        all_model_data.select(["model_agg", "for_order"])
-        .filter(pl.col("model_agg").is_not_null())
-        .unique()
-        .sort("for_order")
+    # Products for every model aggregate across the full model
+    # (ensures product rows appear even if the selected strategy has 0% allocation)
+    product_frame: pl.LazyFrame = (
+        product_matrix.with_row_index("rank")
+        .join(order_lf, on="model_agg", how="inner")
+        .select(
+            [
+                "ma_order",
+                pl.lit(_KIND_PRODUCT).alias("kind"),
+                "rank",
+                pl.col("product_cleaned").alias("asset"),
+                pl.col("ticker").cast(pl.Utf8),
+                # SMAs with many holdings are collapsed to reduce visual clutter
+                (pl.col("num_products") > SMA_COLLAPSE_THRESHOLD).alias("collapsed"),
+                *equity_cols,
+            ]
+        )
     )
-    model_aggs: list[str | None] = model_agg_order["model_agg"].to_list()
 
-    # Pre-process model agg names: remove "Portfolio" suffix
-    model_agg_names: dict[str | None, str] = {
-        ma: str(ma).replace(" Portfolio", "").replace("Portfolio", "")
-        for ma in model_aggs
-    }
+    # Spacer row between model aggs that have products
+    spacer_frame: pl.LazyFrame = order_lf.filter(
+        (pl.col("num_products") > 0) & (pl.col("ma_order") < last_ma_order)
+    ).select(
+        [
+            "ma_order",
+            pl.lit(_KIND_SPACER).alias("kind"),
+            pl.lit(0, dtype=pl.UInt32).alias("rank"),
+            pl.lit("").alias("asset"),
+            pl.lit(None, dtype=pl.Utf8).alias("ticker"),
+            pl.lit(False).alias("collapsed"),
+            *[pl.lit(None, dtype=pl.Float64).alias(col) for col in equity_cols],
+        ]
+    )
 
-    # Track which model_agg is the last one for the spacer row
-    last_model_agg: str | None = model_aggs[-1] if model_aggs else None
+    matrix: pl.DataFrame = (
+        pl.concat([category_frame, product_frame, spacer_frame], how="vertical_relaxed")
+        .sort(["ma_order", "kind", "rank"])
+        .select(["asset", *equity_cols, *_ROW_META_COLUMNS])
+        .collect()
+    )
 
     # ============================================================================
-    # STEP 4: Iterate over model aggregates to build matrix rows
+    # STEP 4: Compute summary metrics
     # ============================================================================
-    data: list[dict[str, Any]] = []
-    row_metadata: list[RowMetadata] = []
-
-    for model_agg in model_aggs:
-        model_agg_name: str = model_agg_names[model_agg]
-
-        # Build model aggregate category row
-        row_data, meta = _build_model_agg_row(
-            model_agg,
-            model_agg_name,
-            available_equity_levels,
-            equity_to_strategy,
-            agg_target_lookup,
-            strategy_color,
-        )
-        data.append(row_data)
-        row_metadata.append(meta)
-
-        # Get products for this model aggregate across the full model
-        # (ensures product rows appear even if the selected strategy has 0% allocation)
-        products: pl.DataFrame = (
-            all_model_data.filter(pl.col("model_agg") == model_agg)
-            .select(["product_cleaned", "ticker", "weight_float"])
-            .group_by(["product_cleaned", "ticker"])
-            .agg(pl.col("weight_float").max().alias("weight_float"))
-            .sort("weight_float", descending=True)
-        )
-
-        # Collapse SMAs with many holdings to reduce visual clutter
-        num_products: int = products.height
-        should_collapse: bool = collapse_sma and num_products > SMA_COLLAPSE_THRESHOLD
-
-        if not should_collapse:
-            product_rows, product_meta = _build_product_rows(
-                products,
-                model_agg,
-                available_equity_levels,
-                equity_to_strategy,
-                product_weight_lookup,
-                strategy_color,
-            )
-            data.extend(product_rows)
-            row_metadata.extend(product_meta)
-
-        # Spacer row between model aggs
-        if products.height > 0 and model_agg != last_model_agg:
-            spacer_row, spacer_meta = _build_spacer_row(
-                available_equity_levels, strategy_color
-            )
-            data.append(spacer_row)
-            row_metadata.append(spacer_meta)
+    summary_metrics_lookup: dict[str, dict[str, float]] = _build_summary_metrics_lookup(
+        all_model_data, equity_to_strategy
+    )
 
-    # ============================================================================
-    # STEP 5: Calculate highlighted column index
-    # ============================================================================
-    highlighted_col_idx = _calculate_highlighted_column(
-        strategy_equity_pct, available_equity_levels
+    return (
+        matrix,
+        equity_to_strategy,
+        column_by_level,
+        collapsible_strategies,
+        summary_metrics_lookup,
     )
 
-    return pl.DataFrame(data), highlighted_col_idx, row_metadata, equity_to_strategy
 
+def _build_metadata_columns(row_metadata: list[RowMetadata]) -> list[pl.Series]:
+    """Build the asset_formatted, is_category and row_color columns in one pass.
 
-def _format_asset_names(row_metadata: list[RowMetadata]) -> list[str]:
-    """Format asset names."""
-    asset_names_combined: list[str] = []
-    for row in row_metadata:
-        name: str = row.name
-        if row.is_spacer:
-            combined_name: str = ""
-        else:
-            combined_name: str = name
-        asset_names_combined.append(combined_name)
+    Args:
+        row_metadata: Row metadata list
 
-    return asset_names_combined
+    Returns:
+        List of Series (asset_formatted, is_category, row_color)
+    """
+    asset_names: tuple[str, ...] = ()
+    is_category: tuple[bool, ...] = ()
+    row_colors: tuple[str, ...] = ()
+    if row_metadata:
+        # Spacer rows display a blank asset name
+        asset_names, is_category, row_colors = zip(
+            *(
+                ("" if meta.is_spacer else meta.name, meta.is_category, meta.color)
+                for meta in row_metadata
+            )
+        )
+    return [
+        pl.Series("asset_formatted", asset_names, dtype=pl.Utf8),
+        pl.Series("is_category", is_category, dtype=pl.Boolean),
+        pl.Series("row_color", row_colors, dtype=pl.Utf8),
+    ]
 
 
 def _prepare_matrix_dataframe(
@@ -741,23 +913,19 @@ def _prepare_matrix_dataframe(
     Returns:
         Formatted DataFrame with asset_formatted, is_category, row_color columns
     """
-    asset_names_combined = _format_asset_names(row_metadata)
-    is_category_list: list[bool] = [meta.is_category for meta in row_metadata]
-    row_colors: list[str] = [meta.color for meta in row_metadata]
+    asset_formatted, is_category, row_color = _build_metadata_columns(row_metadata)
 
-    formatted_matrix_df: pl.DataFrame = matrix_df.with_columns(
+    # Assemble the columns in display order directly (no with_columns + select)
+    return pl.DataFrame(
         [
-            pl.Series("is_category", is_category_list),
-            pl.Series("asset_formatted", asset_names_combined),
-            pl.Series("row_color", row_colors),
+            asset_formatted,
+            *(matrix_df[col] for col in equity_cols),
+            is_category,
+            matrix_df["asset"],
+            row_color,
         ]
     )
 
-    column_order: list[str] = (
-        ["asset_formatted"] + equity_cols + ["is_category", "asset", "row_color"]
-    )
-    return formatted_matrix_df.select(column_order)
-
 
 def _build_summary_metrics_lookup(
     all_model_data: pl.DataFrame,
@@ -772,11 +940,10 @@ def _build_summary_metrics_lookup(
     Returns:
         Dictionary mapping strategy name to metrics dict
     """
+    has_target: pl.Expr = pl.col("total_target") > 0
     summary_strategies_data: pl.DataFrame = (
-        all_model_data.filter(
-            pl.col("strategy").is_in(list(equity_to_strategy.values()))
-        )
-        .select(["strategy", "target", "fee", "yield", "minimum"])
+        all_model_data.lazy()
+        .filter(pl.col("strategy").is_in(list(equity_to_strategy.values())))
         .group_by("strategy")
         .agg(
             [
@@ -786,28 +953,40 @@ def _build_summary_metrics_lookup(
                 pl.col("minimum").first().alias("account_min"),
             ]
         )
+        # Target-weighted averages, computed in the same query
+        .select(
+            [
+                "strategy",
+                pl.when(has_target)
+                .then(pl.col("weighted_fee_sum") / pl.col("total_target"))
+                .otherwise(0.0)
+                .alias("weighted_expense"),
+                pl.when(has_target)
+                .then(pl.col("weighted_yield_sum") / pl.col("total_target"))
+                .otherwise(0.0)
+                .alias("weighted_yield"),
+                "account_min",
+            ]
+        )
+        .collect()
     )
 
-    summary_metrics_lookup: dict[str, dict[str, float]] = {}
-    for row in summary_strategies_data.to_dicts():
-        strategy_name_for_lookup: str = row["strategy"]
-        total_target: float = row["total_target"]
-        weighted_fee_sum: float = row["weighted_fee_sum"]
-        weighted_yield_sum: float = row["weighted_yield_sum"]
-        account_min: float = row["account_min"]
-
-        if total_target > 0:
-            weighted_expense: float = weighted_fee_sum / total_target
-            weighted_yield: float = weighted_yield_sum / total_target
-        else:
-            weighted_expense = 0.0
-            weighted_yield = 0.0
-
-        summary_metrics_lookup[strategy_name_for_lookup] = {
+    # Iterate the aggregated columns directly rather than building a dict per row
+    summary_metrics_lookup: dict[str, dict[str, float]] = {
+        strategy_name_for_lookup: {
             "weighted_expense": weighted_expense,
             "weighted_yield": weighted_yield,
             "account_min": account_min,
         }
+        for (
+            strategy_name_for_lookup,
+            weighted_expense,
+            weighted_yield,
+            account_min,
+        ) in zip(
+            *(series.to_list() for series in summary_strategies_data.get_columns())
+        )
+    }
 
     return summary_metrics_lookup
 
@@ -817,8 +996,8 @@ def _build_summary_rows(
     equity_to_strategy: dict[int, str],
     summary_metrics_lookup: dict[str, dict[str, float]],
     strategy_color: str,
-) -> tuple[list[dict[str, Any]], list[RowMetadata]]:
-    """Build summary metric rows.
+) -> tuple[dict[str, list[Any]], list[RowMetadata]]:
+    """Build summary metric rows as column-wise lists.
 
     Args:
         equity_cols: List of equity column names
@@ -827,58 +1006,39 @@ def _build_summary_rows(
         strategy_color: Strategy color for styling
 
     Returns:
-        Tuple of (list of summary row dicts, list of summary metadata dicts)
+        Tuple of (dict of column name -> summary values, list of summary metadata)
     """
-    summary_metrics_raw: dict[str, dict[str, float | None]] = {
-        "Weighted Expense Ratio": {},
-        "Weighted Indicated Yield": {},
-        "Account Minimum": {},
-    }
-
-    for equity_col_name in equity_cols:
-        try:
-            equity_pct: int = int(equity_col_name)
-        except ValueError:
-            continue
-
-        if equity_pct not in equity_to_strategy:
-            continue
-
-        strategy_name_at_equity: str = equity_to_strategy[equity_pct]
-        if strategy_name_at_equity not in summary_metrics_lookup:
-            continue
-
-        metrics = summary_metrics_lookup[strategy_name_at_equity]
-        summary_metrics_raw["Weighted Expense Ratio"][equity_col_name] = (
-            metrics["weighted_expense"] if metrics["weighted_expense"] else 0.0
-        )
-        # Use None for 0.0 yield so it displays as empty
-        weighted_yield = metrics["weighted_yield"] if metrics["weighted_yield"] else 0.0
-        summary_metrics_raw["Weighted Indicated Yield"][equity_col_name] = (
-            None if weighted_yield == 0.0 else weighted_yield
-        )
-        summary_metrics_raw["Account Minimum"][equity_col_name] = (
-            float(metrics["account_min"]) if metrics["account_min"] else 0.0
-        )
-
-    summary_rows: list[dict[str, Any]] = []
     summary_row_names: list[str] = [
         "Weighted Expense Ratio",
         "Weighted Indicated Yield",
         "Account Minimum",
     ]
+    num_summary_rows: int = len(summary_row_names)
+    summary_columns: dict[str, list[Any]] = {
+        "asset_formatted": summary_row_names,
+        "is_category": [False] * num_summary_rows,
+        "asset": summary_row_names,
+        "row_color": [strategy_color] * num_summary_rows,
+    }
 
-    for summary_name in summary_row_names:
-        summary_row: dict[str, Any] = {"asset_formatted": summary_name}
-        for col in equity_cols:
-            default_val: float | None = (
-                None if summary_name == "Weighted Indicated Yield" else 0.0
-            )
-            summary_row[col] = summary_metrics_raw[summary_name].get(col, default_val)
-        summary_row["is_category"] = False
-        summary_row["asset"] = summary_name
-        summary_row["row_color"] = strategy_color
-        summary_rows.append(summary_row)
+    # Resolve column name -> strategy once instead of parsing each column name
+    strategy_by_col: dict[str, str] = {
+        str(equity_pct): strategy_name_at_equity
+        for equity_pct, strategy_name_at_equity in equity_to_strategy.items()
+    }
+
+    for equity_col_name in equity_cols:
+        metrics = summary_metrics_lookup.get(strategy_by_col.get(equity_col_name))
+        if metrics is None:
+            summary_columns[equity_col_name] = [0.0, None, 0.0]
+            continue
+
+        summary_columns[equity_col_name] = [
+            metrics["weighted_expense"] if metrics["weighted_expense"] else 0.0,
+            # Use None for 0.0 yield so it displays as empty
+            metrics["weighted_yield"] if metrics["weighted_yield"] else None,
+            float(metrics["account_min"]) if metrics["account_min"] else 0.0,
+        ]
 
     summary_metadata: list[RowMetadata] = [
         RowMetadata(
@@ -891,13 +1051,57 @@ def _build_summary_rows(
         for name in summary_row_names
     ]
 
-    return summary_rows, summary_metadata
+    return summary_columns, summary_metadata
+
+
+@lru_cache(maxsize=16)
+def _spacer_metadata(strategy_color: str) -> RowMetadata:
+    """Return the (immutable) metadata entry for a spacer row.
+
+    Args:
+        strategy_color: Strategy color for styling
+
+    Returns:
+        Spacer row metadata
+    """
+    return RowMetadata(
+        row_type=RowType.SPACER,
+        is_category=False,
+        name="",
+        color=strategy_color,
+        is_spacer=True,
+    )
+
+
+@lru_cache(maxsize=8)
+def _spacer_dataframe(
+    schema_items: tuple[tuple[str, pl.DataType], ...], strategy_color: str
+) -> pl.DataFrame:
+    """Return the two blank spacer rows for a table schema.
+
+    Args:
+        schema_items: Table schema as (column name, dtype) pairs
+        strategy_color: Strategy color for styling
+
+    Returns:
+        Two-row spacer DataFrame; value columns are left empty (None)
+    """
+    spacer_values: dict[str, Any] = {
+        "asset_formatted": "",
+        "is_category": False,
+        "asset": "",
+        "row_color": strategy_color,
+    }
+    return pl.DataFrame(
+        {col: [spacer_values.get(col)] * 2 for col, _ in schema_items},
+        schema=dict(schema_items),
+    )
 
 
 def _combine_allocation_and_summary(
     formatted_matrix_df: pl.DataFrame,
     equity_cols: list[str],
-    summary_rows: list[dict[str, Any]],
+    summary_columns: dict[str, list[Any]],
     strategy_color: str,
 ) -> tuple[pl.DataFrame, int, list[RowMetadata]]:
     """Combine allocation and summary DataFrames.
@@ -905,82 +1109,21 @@ def _combine_allocation_and_summary(
     Args:
         formatted_matrix_df: Formatted allocation matrix DataFrame
         equity_cols: List of equity column names
-        summary_rows: List of summary row dicts
+        summary_columns: Dict of column name -> summary row values
         strategy_color: Strategy color for styling
 
-    Returns:
-        Tuple of (combined DataFrame, number of allocation rows, combined metadata)
-    """
-    num_allocation_rows: int = formatted_matrix_df.height
-
-    # Get the exact column order from formatted_matrix_df
-    expected_columns: list[str] = formatted_matrix_df.columns
-
-    # Create spacer rows with all required columns in correct order
-    spacer_row: dict[str, Any] = {}
-    spacer_row_2: dict[str, Any] = {}
-
-    for col in expected_columns:
-        if col == "asset_formatted":
-            spacer_row[col] = ""
-            spacer_row_2[col] = ""
-        elif col == "is_category":
-            spacer_row[col] = False
-            spacer_row_2[col] = False
-        elif col == "asset":
-            spacer_row[col] = ""
-            spacer_row_2[col] = ""
-        elif col == "row_color":
-            spacer_row[col] = strategy_color
-            spacer_row_2[col] = strategy_color
-        else:
-            # Equity columns
-            spacer_row[col] = None
-            spacer_row_2[col] = None
-
-    # Create DataFrames ensuring column order matches
-    spacer_df: pl.DataFrame = pl.DataFrame(
-        [spacer_row], schema=formatted_matrix_df.schema
-    )
-    spacer_df_2: pl.DataFrame = pl.DataFrame(
-        [spacer_row_2], schema=formatted_matrix_df.schema
-    )
-
-    # Ensure summary rows have all columns in correct order
-    summary_rows_with_all_cols: list[dict[str, Any]] = []
-    for summary_row in summary_rows:
-        complete_row: dict[str, Any] = {}
-        for col in expected_columns:
-            if col in summary_row:
-                complete_row[col] = summary_row[col]
-            elif col == "is_category":
-                complete_row[col] = False
-            elif col == "asset":
-                complete_row[col] = summary_row.get("asset_formatted", "")
-            elif col == "row_color":
-                complete_row[col] = strategy_color
-            else:
-                # Equity columns - should already be in summary_row
-                complete_row[col] = summary_row.get(col, 0.0)
-        summary_rows_with_all_cols.append(complete_row)
-
-    summary_df_data: pl.DataFrame = pl.DataFrame(
-        summary_rows_with_all_cols, schema=formatted_matrix_df.schema
-    )
+    Returns:
+        Tuple of (combined DataFrame, number of allocation rows, combined metadata)
+    """
+    num_allocation_rows: int = formatted_matrix_df.height
 
-    combined_df: pl.DataFrame = pl.concat(
-        [formatted_matrix_df, spacer_df, spacer_df_2, summary_df_data]
-    )
+    schema = formatted_matrix_df.schema
+    spacer_df: pl.DataFrame = _spacer_dataframe(tuple(schema.items()), strategy_color)
+    summary_df: pl.DataFrame = pl.DataFrame(summary_columns, schema=schema)
 
-    # Build combined metadata
-    spacer_metadata = RowMetadata(
-        row_type=RowType.SPACER,
-        is_category=False,
-        name="",
-        color=strategy_color,
-        is_spacer=True,
-    )
+    combined_df: pl.DataFrame = pl.concat([formatted_matrix_df, spacer_df, summary_df])
 
+    spacer_metadata: RowMetadata = _spacer_metadata(strategy_color)
     return combined_df, num_allocation_rows, [spacer_metadata, spacer_metadata]
 
 
@@ -1019,8 +1162,9 @@ def _build_base_table(
         "weight": "Weight",
     }
     for col in equity_cols:
-        if col in internal_to_display:
-            display_labels[col] = internal_to_display[col]
+        label = internal_to_display.get(col)
+        if label is not None:
+            display_labels[col] = label
 
     return (
         GT(combined_df)
@@ -1032,12 +1176,15 @@ def _build_base_table(
     )
 
 
-def _apply_allocation_formatting(
+def _apply_percent_formatting(
     table: GT,
     equity_cols: list[str],
     num_allocation_rows: int,
 ) -> GT:
-    """Apply percent formatting to allocation rows.
+    """Apply percent formatting to allocation rows and the expense ratio row.
+
+    Both use the same two-decimal percent format, so they share a single
+    fmt_percent pass instead of one per row group.
 
     Args:
         table: GT table
@@ -1045,13 +1192,15 @@ def _apply_allocation_formatting(
         num_allocation_rows: Number of allocation rows
 
     Returns:
-        GT table with allocation formatting
+        GT table with percent formatting
     """
-    if num_allocation_rows > 0:
-        return table.fmt_percent(
-            columns=equity_cols, decimals=2, rows=list(range(num_allocation_rows))
-        )
-    return table
+    # Expense ratio is the first summary row, after the two spacer rows
+    expense_ratio_idx: int = num_allocation_rows + 2
+    return table.fmt_percent(
+        columns=equity_cols,
+        decimals=2,
+        rows=[*range(num_allocation_rows), expense_ratio_idx],
+    )
 
 
 def _apply_summary_formatting(
@@ -1059,7 +1208,7 @@ def _apply_summary_formatting(
     equity_cols: list[str],
     num_allocation_rows: int,
 ) -> GT:
-    """Apply formatting to summary rows (percent for expense/yield, currency for min).
+    """Apply formatting to the yield (percent) and account minimum (currency) rows.
 
     Args:
         table: GT table
@@ -1072,44 +1221,18 @@ def _apply_summary_formatting(
     num_spacer_rows: int = 2
     summary_start_idx: int = num_allocation_rows + num_spacer_rows
 
-    expense_ratio_idx: int = summary_start_idx
     indicated_yield_idx: int = summary_start_idx + 1
     account_min_idx: int = summary_start_idx + 2
 
-    # Format expense ratio as percentage
-    table = table.fmt_percent(columns=equity_cols, decimals=2, rows=[expense_ratio_idx])
-
     # Format yield as percentage, but show empty string for 0.0%
-    def format_yield(x: Any) -> str:
-        """Format yield as percentage, or empty string if 0.0%."""
-        if x is None:
-            return ""
-        try:
-            val = float(x)
-            if val == 0.0:
-                return ""
-            return f"{val:.2%}"
-        except (ValueError, TypeError):
-            return ""
-
-    for col in equity_cols:
-        table = table.fmt(columns=[col], rows=[indicated_yield_idx], fns=format_yield)
+    table = table.fmt(
+        columns=equity_cols, rows=[indicated_yield_idx], fns=_format_yield
+    )
 
     # Format account minimum as compact currency
-    def format_account_min(x: Any) -> str:
-        """Format Account Minimum value as compact currency."""
-        if x is None:
-            raise ValueError(
-                "Account minimum value is None. ETL pipeline must ensure all account minimum values are non-null."
-            )
-        if x == "":
-            raise ValueError(
-                "Account minimum value is empty string. ETL pipeline must ensure all account minimum values are numeric."
-            )
-        return _format_currency_compact(float(x))
-
-    for col in equity_cols:
-        table = table.fmt(columns=[col], rows=[account_min_idx], fns=format_account_min)
+    table = table.fmt(
+        columns=equity_cols, rows=[account_min_idx], fns=_format_account_min
+    )
 
     return table
 
@@ -1133,18 +1256,14 @@ def _apply_table_styling(
     Returns:
         Fully styled GT table
     """
-    style_config = TableStyleConfig()
-
     # Header styling
     table = table.tab_style(
         style=[
             style.fill(color=strategy_color),
             style.text(
-                color="white", weight="bold", size=style_config.header_font_size
-            ),
-            style.css(
-                rule=f"font-family: '{style_config.header_font}', serif !important; padding: {style_config.header_padding} !important;"
+                color="white", weight="bold", size=TABLE_STYLE_CONFIG.header_font_size
             ),
+            style.css(rule=TABLE_STYLE_CONFIG.header_css),
         ],
         locations=loc.column_labels(),
     )
@@ -1164,7 +1283,7 @@ def _apply_table_styling(
         table,
         row_groups[RowType.CATEGORY],
         RowType.CATEGORY,
-        style_config,
+        TABLE_STYLE_CONFIG,
         row_colors=row_colors,
         equity_cols=equity_cols,
     )
@@ -1172,29 +1291,29 @@ def _apply_table_styling(
         table,
         row_groups[RowType.PRODUCT],
         RowType.PRODUCT,
-        style_config,
+        TABLE_STYLE_CONFIG,
         equity_cols=equity_cols,
     )
     table = _apply_row_styling(
         table,
         row_groups[RowType.SPACER],
         RowType.SPACER,
-        style_config,
+        TABLE_STYLE_CONFIG,
     )
     table = _apply_row_styling(
         table,
         row_groups[RowType.SUMMARY],
         RowType.SUMMARY,
-        style_config,
+        TABLE_STYLE_CONFIG,
         strategy_color=strategy_color,
         equity_cols=equity_cols,
     )
 
     # Table-wide options
     table = table.tab_options(
-        table_font_size=style_config.body_font_size,
+        table_font_size=TABLE_STYLE_CONFIG.body_font_size,
         table_font_names=[
-            style_config.body_font,
+            TABLE_STYLE_CONFIG.body_font,
             "-apple-system",
             "BlinkMacSystemFont",
             "Segoe UI",
@@ -1205,9 +1324,7 @@ def _apply_table_styling(
     # Ensure all body cells use IBM Plex Sans
     table = table.tab_style(
         style=[
-            style.css(
-                rule=f"font-family: '{style_config.body_font}', sans-serif !important;"
-            ),
+            style.css(rule=TABLE_STYLE_CONFIG.body_font_css),
         ],
         locations=loc.body(),
     )
@@ -1216,7 +1333,7 @@ def _apply_table_styling(
     if highlighted_col_idx >= 1 and highlighted_col_idx - 1 < len(equity_cols):
         highlighted_col: str = equity_cols[highlighted_col_idx - 1]
         table = table.tab_style(
-            style=[style.fill(color=style_config.highlight_color)],
+            style=[style.fill(color=TABLE_STYLE_CONFIG.highlight_color)],
             locations=loc.body(columns=[highlighted_col]),
         )
 
@@ -1229,26 +1346,21 @@ def _build_allocation_tables(
     row_metadata: list[RowMetadata],
     header_name: str,
     highlighted_col_idx: int,
-    all_model_data: pl.DataFrame,
+    summary_metrics_lookup: dict[str, dict[str, float]],
     equity_to_strategy: dict[int, str],
     strategy_color: str,
 ) -> GT:
     """Build combined allocation table with summary metrics included.
 
     Steps:
-    1. Format asset names
-    2. Prepare matrix data with formatted columns
-    3. Pre-compute summary metrics lookup
-    4. Add spacer row and summary metric rows to DataFrame
-    5. Build and style combined table
+    1. Format asset names and prepare matrix data with formatted columns
+    2. Build summary metric rows from the precomputed lookup
+    3. Add spacer row and summary metric rows to DataFrame
+    4. Build and style combined table
 
     Returns:
         Single GT table object containing both allocation and summary rows
     """
-    strategy_color: str = (
-        row_metadata[0].color if row_metadata else PRIMARY["raspberry"]
-    )
-
     # ============================================================================
     # STEP 1: Format asset names and prepare matrix DataFrame
     # ============================================================================
@@ -1257,36 +1369,31 @@ def _build_allocation_tables(
     )
 
     # ============================================================================
-    # STEP 2: Build summary metrics lookup
-    # ============================================================================
-    summary_metrics_lookup = _build_summary_metrics_lookup(
-        all_model_data, equity_to_strategy
-    )
-
-    # ============================================================================
-    # STEP 3: Build summary rows
+    # STEP 2: Build summary rows
     # ============================================================================
-    summary_rows, summary_metadata = _build_summary_rows(
+    summary_columns, summary_metadata = _build_summary_rows(
         equity_cols, equity_to_strategy, summary_metrics_lookup, strategy_color
     )
 
     # ============================================================================
-    # STEP 4: Combine allocation and summary DataFrames
+    # STEP 3: Combine allocation and summary DataFrames
     # ============================================================================
     combined_df, num_allocation_rows, spacer_metadata = _combine_allocation_and_summary(
-        formatted_matrix_df, equity_cols, summary_rows, strategy_color
+        formatted_matrix_df, equity_cols, summary_columns, strategy_color
     )
 
     # Build combined metadata
-    combined_row_metadata: list[RowMetadata] = row_metadata.copy()
-    combined_row_metadata.extend(spacer_metadata)
-    combined_row_metadata.extend(summary_metadata)
+    combined_row_metadata: list[RowMetadata] = [
+        *row_metadata,
+        *spacer_metadata,
+        *summary_metadata,
+    ]
 
     # ============================================================================
-    # STEP 5: Build and style combined table
+    # STEP 4: Build and style combined table
     # ============================================================================
     combined_table = _build_base_table(combined_df, header_name, equity_cols)
-    combined_table = _apply_allocation_formatting(
+    combined_table = _apply_percent_formatting(
         combined_table, equity_cols, num_allocation_rows
     )
     combined_table = _apply_summary_formatting(
@@ -1341,12 +1448,55 @@ def _is_asset_class_strategy(strategy_data: dict[str, Any] | None) -> bool:
     return any(subtype in subtype_str for subtype in asset_class_subtypes)
 
 
+@st.cache_data(ttl=3600, max_entries=32, hash_funcs={pl.LazyFrame: hash_lazyframe})
+def _get_asset_class_model_data(
+    cleaned_data: pl.LazyFrame, strategy_name: str
+) -> pl.DataFrame:
+    """Get and cache the product rows of an Asset Class strategy.
+
+    Asset Class strategies don't have ss_suite, so they are filtered by
+    strategy name instead of going through _get_model_data.
+
+    Args:
+        cleaned_data: Full cleaned data LazyFrame
+        strategy_name: Name of the strategy
+
+    Returns:
+        Pre-processed product rows for the strategy
+    """
+    normalized_strategy = strategy_name.strip().lower()
+    return _preprocess_product_data(
+        cleaned_data.filter(
+            pl.col("strategy").str.strip_chars().str.to_lowercase()
+            == normalized_strategy
+        ).select(
+            [
+                "strategy",
+                "portfolio",
+                "model_agg",
+                "product",
+                "ticker",
+                "target",
+                "agg_target",
+                "weight",
+                "fee",
+                "yield",
+                "minimum",
+            ]
+        )
+    ).collect()
+
+
 def _load_strategy_allocation_data(
     cleaned_data: pl.LazyFrame,
     strategy_name: str,
 ) -> tuple[dict[str, Any] | None, int | None, str | None, pl.DataFrame]:
     """Load strategy data and prepare model data.
 
+    Not cached itself: the strategy row and both model frames come from
+    cached loaders, so suite data is held once per suite rather than once
+    per strategy.
+
     Args:
         cleaned_data: Full cleaned data LazyFrame
         strategy_name: Name of the strategy
@@ -1365,35 +1515,11 @@ def _load_strategy_allocation_data(
         strategy_equity_pct = int(portfolio) if portfolio > 0 else None
 
     # Get model data for summary table (cached)
-    # Asset Class strategies don't have ss_suite, so filter by strategy name directly
     suite = strategy_data.get("ss_suite", "") if strategy_data else ""
     if strategy_data and suite and not _is_asset_class_strategy(strategy_data):
         all_model_data: pl.DataFrame = _get_model_data(cleaned_data, suite)
     elif strategy_data:
-        # Asset Class strategies: filter by strategy name directly
-        normalized_strategy = strategy_name.strip().lower()
-        all_model_data = (
-            cleaned_data.filter(
-                pl.col("strategy").str.strip_chars().str.to_lowercase()
-                == normalized_strategy
-            )
-            .select(
-                [
-                    "strategy",
-                    "portfolio",
-                    "model_agg",
-                    "product",
-                    "ticker",
-                    "target",
-                    "agg_target",
-                    "weight",
-                    "fee",
-                    "yield",
-                    "minimum",
-                ]
-            )
-            .collect()
-        )
+        all_model_data = _get_asset_class_model_data(cleaned_data, strategy_name)
     else:
         all_model_data = pl.DataFrame()
 
@@ -1403,76 +1529,107 @@ def _load_strategy_allocation_data(
 def _prepare_allocation_matrix(
     cleaned_data: pl.LazyFrame,
     strategy_name: str,
+    strategy_data: dict[str, Any],
     strategy_equity_pct: int | None,
     collapse_sma: bool,
-) -> tuple[pl.DataFrame, int, list[RowMetadata], dict[int, str], list[str]]:
+) -> tuple[
+    pl.DataFrame,
+    int,
+    list[RowMetadata],
+    dict[int, str],
+    list[str],
+    bool,
+    dict[str, dict[str, float]],
+]:
     """Prepare allocation matrix data.
 
     Args:
         cleaned_data: Full cleaned data LazyFrame
         strategy_name: Name of the strategy
+        strategy_data: Strategy row already loaded by the caller
         strategy_equity_pct: Strategy equity percentage
         collapse_sma: Whether to collapse SMAs
 
     Returns:
-        Tuple of (matrix_df, highlighted_col_idx, row_metadata, equity_to_strategy, equity_cols)
+        Tuple of (matrix_df, highlighted_col_idx, row_metadata, equity_to_strategy,
+        equity_cols, has_collapsible_smas, summary_metrics_lookup)
     """
-    matrix_df, highlighted_col_idx, row_metadata, equity_to_strategy = (
-        _get_equity_matrix_data(
-            cleaned_data, strategy_name, strategy_equity_pct, collapse_sma=collapse_sma
-        )
-    )
-
-    if matrix_df.height == 0:
-        return matrix_df, highlighted_col_idx, row_metadata, equity_to_strategy, []
-
-    equity_cols: list[str] = [col for col in matrix_df.columns if col != "asset"]
-
-    # Prepare metadata for styling
-    is_category_list: list[bool] = [meta.is_category for meta in row_metadata]
-    row_colors: list[str] = [meta.color for meta in row_metadata]
+    strategy_color: str = get_subtype_color(strategy_data.get("ss_subtype", ""))
+    (
+        matrix_df,
+        equity_to_strategy,
+        column_by_level,
+        collapsible_strategies,
+        summary_metrics_lookup,
+    ) = _get_equity_matrix_data(cleaned_data, strategy_data.get("ss_suite", ""))
+    # Per-strategy lookups stay outside the cached matrix build
+    highlighted_col_idx: int = column_by_level.get(strategy_equity_pct, 0)
+    has_collapsible: bool = strategy_name.strip().lower() in collapsible_strategies
+    if collapse_sma:
+        matrix_df = matrix_df.filter(~pl.col("collapsed"))
+    row_metadata: list[RowMetadata] = _build_row_metadata(matrix_df, strategy_color)
+    # Styling columns are derived from row_metadata in _prepare_matrix_dataframe
+    matrix_df = matrix_df.drop(_ROW_META_COLUMNS)
+
+    # The matrix is laid out as asset followed by the equity columns
+    equity_cols: list[str] = matrix_df.columns[1:] if matrix_df.height > 0 else []
 
-    # Add formatted columns to matrix_df
-    matrix_df = matrix_df.with_columns(
-        [
-            pl.Series("is_category", is_category_list),
-            pl.Series("row_color", row_colors),
-        ]
+    return (
+        matrix_df,
+        highlighted_col_idx,
+        row_metadata,
+        equity_to_strategy,
+        equity_cols,
+        has_collapsible,
+        summary_metrics_lookup,
     )
 
-    return matrix_df, highlighted_col_idx, row_metadata, equity_to_strategy, equity_cols
 
-
-def _render_allocation_table(
-    matrix_df: pl.DataFrame,
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _build_allocation_table_html(
+    table_key: str,
+    _matrix_df: pl.DataFrame,
     equity_cols: list[str],
-    row_metadata: list[RowMetadata],
+    _row_metadata: list[RowMetadata],
     header_name: str,
     highlighted_col_idx: int,
-    all_model_data: pl.DataFrame,
+    summary_metrics_lookup: dict[str, dict[str, float]],
     equity_to_strategy: dict[int, str],
     strategy_color: str,
-) -> None:
-    """Render the allocation table.
+) -> str:
+    """Build, style and render the allocation table to its final HTML string.
+
+    Underscore-prefixed arguments are skipped by Streamlit's hasher; their
+    contents are already covered by ``table_key``, so reruns with unchanged
+    inputs return the cached HTML without rebuilding the GT object. The
+    summary metrics are small and passed hashed, so a data reload that only
+    changes fees, yields or minimums still produces a new entry.
 
     Args:
-        matrix_df: Matrix DataFrame
+        table_key: Fingerprint of the matrix, row metadata and static inputs
+        _matrix_df: Matrix DataFrame
         equity_cols: List of equity column names
-        row_metadata: Row metadata list
+        _row_metadata: Row metadata list
         header_name: Header name for asset column
         highlighted_col_idx: Index of highlighted column
-        all_model_data: Model data DataFrame
+        summary_metrics_lookup: Summary metrics per strategy
         equity_to_strategy: Equity to strategy mapping
         strategy_color: Strategy color
+
+    Returns:
+        Complete HTML string for the table
     """
+    # Body only runs on a cache miss
+    logger.debug(f"[CACHE MISS] Building allocation table HTML: {table_key}")
+
     # Build combined table
     combined_table = _build_allocation_tables(
-        matrix_df=matrix_df,
+        matrix_df=_matrix_df,
         equity_cols=equity_cols,
-        row_metadata=row_metadata,
+        row_metadata=_row_metadata,
         header_name=header_name,
         highlighted_col_idx=highlighted_col_idx,
-        all_model_data=all_model_data,
+        summary_metrics_lookup=summary_metrics_lookup,
         equity_to_strategy=equity_to_strategy,
         strategy_color=strategy_color,
     )
@@ -1485,34 +1642,120 @@ def _render_allocation_table(
     )
 
     # Set column widths
-    width_cases: dict[str, str] = {"asset_formatted": asset_col_width}
-    width_cases.update({col: equity_col_width for col in equity_cols})
+    width_cases: dict[str, str] = {
+        "asset_formatted": asset_col_width,
+        **dict.fromkeys(equity_cols, equity_col_width),
+    }
     combined_table = combined_table.cols_width(cases=width_cases)
 
     # Generate table HTML
     table_html: str = combined_table.as_raw_html(inline_css=True)
 
-    # Generate hash for caching
-    table_data_hash: str = hashlib.md5(
-        (
-            str(matrix_df.write_json())
-            + str(equity_cols)
-            + str(header_name)
-            + asset_col_width
-            + equity_col_width
-            + str(strategy_color)
-        ).encode()
-    ).hexdigest()
-
-    # Generate complete HTML (cached)
-    complete_html: str = _generate_allocation_table_html_cached(
-        table_html, table_data_hash
+    return _wrap_allocation_table_html(table_html)
+
+
+def _render_allocation_table(
+    matrix_df: pl.DataFrame,
+    equity_cols: list[str],
+    row_metadata: list[RowMetadata],
+    header_name: str,
+    highlighted_col_idx: int,
+    summary_metrics_lookup: dict[str, dict[str, float]],
+    equity_to_strategy: dict[int, str],
+    strategy_color: str,
+    static_key: str,
+) -> None:
+    """Render the allocation table.
+
+    Args:
+        matrix_df: Matrix DataFrame
+        equity_cols: List of equity column names
+        row_metadata: Row metadata list
+        header_name: Header name for asset column
+        highlighted_col_idx: Index of highlighted column
+        summary_metrics_lookup: Summary metrics per strategy
+        equity_to_strategy: Equity to strategy mapping
+        strategy_color: Strategy color
+        static_key: Cache-key part for inputs fixed by the strategy selection
+            and collapse toggle (model, header, color, equity columns)
+    """
+    # Combine the caller's static key with the data fingerprints; the cached
+    # builder keys on this string
+    table_key: str = _frame_fingerprint(
+        matrix_df,
+        static_key,
+        _metadata_fingerprint(row_metadata),
+        str(highlighted_col_idx),
+        str(sorted(equity_to_strategy.items())),
+    )
+
+    complete_html: str = _build_allocation_table_html(
+        table_key,
+        matrix_df,
+        equity_cols,
+        row_metadata,
+        header_name,
+        highlighted_col_idx,
+        summary_metrics_lookup,
+        equity_to_strategy,
+        strategy_color,
     )
 
     # Render table
     st.html(complete_html)
 
 
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _build_asset_class_table_html(
+    table_key: str,
+    _combined_df: pl.DataFrame,
+    _combined_metadata: list[RowMetadata],
+    strategy_name: str,
+    strategy_color: str,
+    num_allocation_rows: int,
+) -> str:
+    """Build, style and render the asset-class table to its final HTML string.
+
+    Args:
+        table_key: Fingerprint of the combined DataFrame, row metadata, name and color
+        _combined_df: Product, spacer and summary rows (not hashed)
+        _combined_metadata: Row metadata for _combined_df (not hashed)
+        strategy_name: Strategy name, used as the asset column header
+        strategy_color: Strategy color
+        num_allocation_rows: Number of product rows before the spacers
+
+    Returns:
+        Complete HTML string for the table
+    """
+    # Body only runs on a cache miss
+    logger.debug(f"[CACHE MISS] Building asset-class table HTML: {table_key}")
+
+    equity_cols = ["weight"]
+    combined_table = _build_base_table(_combined_df, strategy_name, equity_cols)
+    combined_table = combined_table.cols_label({"weight": "Weight"})
+    combined_table = _apply_percent_formatting(
+        combined_table, equity_cols, num_allocation_rows
+    )
+    combined_table = _apply_summary_formatting(
+        combined_table, equity_cols, num_allocation_rows
+    )
+    combined_table = _apply_table_styling(
+        combined_table,
+        _combined_metadata,
+        strategy_color,
+        equity_cols,
+        highlighted_col_idx=0,
+    )
+
+    # Set column widths (single weight column)
+    combined_table = combined_table.cols_width(
+        cases={"asset_formatted": "80%", "weight": "20%"}
+    )
+
+    table_html: str = combined_table.as_raw_html(inline_css=True)
+    return _wrap_allocation_table_html(table_html)
+
+
 def _render_asset_class_table(
     strategy_name: str,
     all_model_data: pl.DataFrame,
@@ -1529,165 +1772,107 @@ def _render_asset_class_table(
     # Filter to the selected strategy only (case/whitespace tolerant)
     normalized_strategy = strategy_name.strip().lower()
     strategy_products = all_model_data.filter(
-        pl.col("strategy").str.strip_chars().str.to_lowercase() == normalized_strategy
+        pl.col("strategy_norm") == normalized_strategy
     )
     if strategy_products.height == 0:
         st.info("No allocation data available for this strategy.")
         return
 
-    data_rows: list[dict[str, Any]] = []
-    row_metadata: list[RowMetadata] = []
-
     # Asset-Class strategies are expected to have a single model agg,
     # so just render the strategy's own products without grouping.
-    for product_row in (
-        strategy_products.select(["product_cleaned", "ticker", "weight_float"])
-        .sort("weight_float", descending=True)
-        .to_dicts()
-    ):
-        product_name = product_row["product_cleaned"]
-        ticker = product_row["ticker"]
-        weight_val = product_row["weight_float"]
-
-        data_rows.append({"asset": product_name, "weight": weight_val})
-        row_metadata.append(
-            RowMetadata(
-                row_type=RowType.PRODUCT,
-                is_category=False,
-                name=product_name,
-                ticker=ticker,
-                color=strategy_color,
-            )
+    sorted_products: pl.DataFrame = strategy_products.select(
+        ["product_cleaned", "ticker", "weight_float"]
+    ).sort("weight_float", descending=True)
+    weights: list[float | None] = sorted_products["weight_float"].to_list()
+    row_metadata: list[RowMetadata] = [
+        RowMetadata(
+            row_type=RowType.PRODUCT,
+            is_category=False,
+            name=product_name,
+            ticker=ticker,
+            color=strategy_color,
         )
+        for product_name, ticker in zip(
+            sorted_products["product_cleaned"].to_list(),
+            sorted_products["ticker"].to_list(),
+        )
+    ]
+    num_allocation_rows: int = len(row_metadata)
 
-    asset_names_combined = _format_asset_names(row_metadata)
-    is_category_list: list[bool] = [meta.is_category for meta in row_metadata]
-    row_colors: list[str] = [meta.color for meta in row_metadata]
-
-    base_df = pl.DataFrame(data_rows).with_columns(
-        [
-            pl.Series("asset_formatted", asset_names_combined),
-            pl.Series("is_category", is_category_list),
-            pl.Series("row_color", row_colors),
-        ]
-    )
-    base_df = base_df.select(
-        ["asset_formatted", "weight", "is_category", "asset", "row_color"]
-    )
-
-    # Build summary rows
-    summary_rows = [
-        {
-            "asset_formatted": "Weighted Expense Ratio",
-            "weight": expense_ratio,
-            "is_category": False,
-            "asset": "Weighted Expense Ratio",
-            "row_color": strategy_color,
-        },
-        {
-            "asset_formatted": "Weighted Indicated Yield",
-            "weight": None if (yield_pct is None or yield_pct == 0.0) else yield_pct,
-            "is_category": False,
-            "asset": "Weighted Indicated Yield",
-            "row_color": strategy_color,
-        },
-        {
-            "asset_formatted": "Account Minimum",
-            "weight": float(minimum),
-            "is_category": False,
-            "asset": "Account Minimum",
-            "row_color": strategy_color,
-        },
+    # Summary rows
+    summary_row_names: list[str] = [
+        "Weighted Expense Ratio",
+        "Weighted Indicated Yield",
+        "Account Minimum",
     ]
     summary_metadata: list[RowMetadata] = [
         RowMetadata(
             row_type=RowType.SUMMARY,
             is_category=False,
-            name=str(row["asset_formatted"]),
+            name=name,
             color=strategy_color,
             is_summary=True,
         )
-        for row in summary_rows
+        for name in summary_row_names
     ]
-
-    # Spacer rows
-    spacer_row = {
-        "asset_formatted": "",
-        "weight": None,
-        "is_category": False,
-        "asset": "",
-        "row_color": strategy_color,
-    }
-    spacer_df = pl.DataFrame([spacer_row, spacer_row], schema=base_df.schema)
-    summary_df = pl.DataFrame(summary_rows, schema=base_df.schema)
-
-    combined_df = pl.concat([base_df, spacer_df, summary_df])
-    combined_metadata = (
-        row_metadata
-        + [
-            RowMetadata(
-                row_type=RowType.SPACER,
-                is_category=False,
-                name="",
-                color=strategy_color,
-                is_spacer=True,
-            ),
-            RowMetadata(
-                row_type=RowType.SPACER,
-                is_category=False,
-                name="",
-                color=strategy_color,
-                is_spacer=True,
-            ),
+    weights.extend(
+        [
+            # Two spacer rows
+            None,
+            None,
+            expense_ratio,
+            None if (yield_pct is None or yield_pct == 0.0) else yield_pct,
+            float(minimum),
         ]
-        + summary_metadata
     )
 
-    equity_cols = ["weight"]
-    combined_table = _build_base_table(combined_df, strategy_name, equity_cols)
-    combined_table = combined_table.cols_label({"weight": "Weight"})
-    combined_table = _apply_allocation_formatting(
-        combined_table, equity_cols, base_df.height
+    spacer_metadata: RowMetadata = _spacer_metadata(strategy_color)
+    combined_metadata: list[RowMetadata] = [
+        *row_metadata,
+        spacer_metadata,
+        spacer_metadata,
+        *summary_metadata,
+    ]
+
+    # Build product, spacer and summary rows in a single construction; the
+    # display name doubles as the asset column (blank for spacers)
+    combined_df: pl.DataFrame = pl.DataFrame(
+        [
+            *_build_metadata_columns(combined_metadata),
+            pl.Series("weight", weights, dtype=pl.Float64),
+        ]
+    ).select(
+        "asset_formatted",
+        "weight",
+        "is_category",
+        pl.col("asset_formatted").alias("asset"),
+        "row_color",
     )
-    combined_table = _apply_summary_formatting(
-        combined_table, equity_cols, base_df.height
+
+    table_key: str = _frame_fingerprint(
+        combined_df,
+        str(strategy_name),
+        str(strategy_color),
+        _metadata_fingerprint(combined_metadata),
     )
-    combined_table = _apply_table_styling(
-        combined_table,
+    complete_html: str = _build_asset_class_table_html(
+        table_key,
+        combined_df,
         combined_metadata,
+        strategy_name,
         strategy_color,
-        equity_cols,
-        highlighted_col_idx=0,
-    )
-
-    # Set column widths (single weight column)
-    combined_table = combined_table.cols_width(
-        cases={"asset_formatted": "80%", "weight": "20%"}
-    )
-
-    table_html: str = combined_table.as_raw_html(inline_css=True)
-    table_data_hash: str = hashlib.md5(
-        (
-            str(combined_df.write_json()) + str(strategy_name) + str(strategy_color)
-        ).encode()
-    ).hexdigest()
-    complete_html: str = _generate_allocation_table_html_cached(
-        table_html, table_data_hash
+        num_allocation_rows,
     )
     st.html(complete_html)
 
 
-def _render_collapse_toggle(
-    all_model_data: pl.DataFrame,
-    strategy_name: str,
-) -> None:
+def _render_collapse_toggle(has_collapsible_smas: bool) -> None:
     """Render collapse SMAs toggle if applicable.
 
     Args:
-        all_model_data: Model data DataFrame
-        strategy_name: Name of the strategy
+        has_collapsible_smas: Whether any model aggregate exceeds the collapse threshold
     """
-    if _has_collapsible_smas(all_model_data, strategy_name):
+    if has_collapsible_smas:
         st.session_state.setdefault(ALLOCATION_COLLAPSE_SMA_KEY, DEFAULT_COLLAPSE_SMA)
         st.toggle("Collapse SMAs", key=ALLOCATION_COLLAPSE_SMA_KEY)
 
@@ -1721,6 +1906,30 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
     # Note: cleaned_data uses lowercase column names
     row1_col1, row1_col2, row1_col3 = st.columns(3)
     normalized_strategy = strategy_name.strip().lower()
+
+    # Get expense ratio and yield from strategy data (cleaned_data has lowercase
+    # column names); if either is missing, fall back to target-weighted values
+    # from model data, computed together in one filtered pass
+    expense_ratio = strategy_data.get("fee", 0) or 0
+    y: float = strategy_data.get("yield", 0) or 0
+    if (expense_ratio == 0 or y == 0.0) and all_model_data.height > 0:
+        total_target, weighted_fee_sum, weighted_yield_sum = (
+            all_model_data.lazy()
+            .filter(pl.col("strategy_norm") == normalized_strategy)
+            .select(
+                pl.col("target").sum().alias("total_target"),
+                (pl.col("target") * pl.col("fee")).sum().alias("weighted_fee_sum"),
+                (pl.col("target") * pl.col("yield")).sum().alias("weighted_yield_sum"),
+            )
+            .collect()
+            .row(0)
+        )
+        if total_target > 0:
+            if expense_ratio == 0:
+                expense_ratio = weighted_fee_sum / total_target
+            if y == 0.0:
+                y = weighted_yield_sum / total_target
+
     with row1_col1:
         # Get minimum from strategy data
         minimum = strategy_data.get("minimum", 0) or 0
@@ -1729,38 +1938,8 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
             _format_currency_compact(float(minimum)) if minimum else "$0.0",
         )
     with row1_col2:
-        # Get expense ratio from strategy data (cleaned_data has lowercase column names)
-        expense_ratio = strategy_data.get("fee", 0) or 0
-        # If not found, calculate weighted expense ratio from model data
-        if expense_ratio == 0 and all_model_data.height > 0:
-            strategy_model_data = all_model_data.filter(
-                pl.col("strategy").str.strip_chars().str.to_lowercase()
-                == normalized_strategy
-            )
-            if strategy_model_data.height > 0:
-                total_target = strategy_model_data["target"].sum()
-                weighted_fee_sum = (
-                    strategy_model_data["target"] * strategy_model_data["fee"]
-                ).sum()
-                if total_target > 0:
-                    expense_ratio = weighted_fee_sum / total_target
         st.metric("WEIGHTED AVG EXP RATIO", f"{expense_ratio * 100:.2f}%")
     with row1_col3:
-        # Get yield from strategy data
-        y: float = strategy_data.get("yield", 0) or 0
-        # If not found, calculate weighted yield from model data
-        if y == 0.0 and all_model_data.height > 0:
-            strategy_model_data = all_model_data.filter(
-                pl.col("strategy").str.strip_chars().str.to_lowercase()
-                == normalized_strategy
-            )
-            if strategy_model_data.height > 0:
-                total_target = strategy_model_data["target"].sum()
-                weighted_yield_sum = (
-                    strategy_model_data["target"] * strategy_model_data["yield"]
-                ).sum()
-                if total_target > 0:
-                    y = weighted_yield_sum / total_target
         # Only show yield if it exists and is not 0.0, otherwise show empty
         if y and y != 0.0:
             st.metric("12-MONTH YIELD", f"{y * 100:.2f}%")
@@ -1770,12 +1949,6 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
     st.divider()
 
     # If this is an Asset-Class or Special Situation strategy, render a simplified table
-    preprocessed_model_data = (
-        _preprocess_product_data(all_model_data)
-        if all_model_data.height > 0
-        else all_model_data
-    )
-
     # Check if this is an Asset Class strategy using ss_type and ss_subtype
     is_asset_class = _is_asset_class_strategy(strategy_data)
 
@@ -1803,7 +1976,7 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
         )
         _render_asset_class_table(
             strategy_name,
-            preprocessed_model_data,
+            all_model_data,
             strategy_color,
             expense_ratio,
             y,
@@ -1816,10 +1989,16 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
     # ============================================================================
     # STEP 3: Build equity matrix data
     # ============================================================================
-    matrix_df, highlighted_col_idx, row_metadata, equity_to_strategy, equity_cols = (
-        _prepare_allocation_matrix(
-            cleaned_data, strategy_name, strategy_equity_pct, collapse_sma
-        )
+    (
+        matrix_df,
+        highlighted_col_idx,
+        row_metadata,
+        equity_to_strategy,
+        equity_cols,
+        has_collapsible_smas,
+        summary_metrics_lookup,
+    ) = _prepare_allocation_matrix(
+        cleaned_data, strategy_name, strategy_data, strategy_equity_pct, collapse_sma
     )
 
     if matrix_df.height == 0:
@@ -1836,6 +2015,18 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
         row_metadata[0].color if row_metadata else PRIMARY["raspberry"]
     )
 
+    # Key parts that only change with the strategy selection or collapse toggle
+    static_key: str = "|".join(
+        [
+            strategy_name,
+            strategy_data.get("ss_suite", ""),
+            str(collapse_sma),
+            header_name,
+            strategy_color,
+            *equity_cols,
+        ]
+    )
+
     # ============================================================================
     # STEP 4: Render combined allocation table
     # ============================================================================
@@ -1846,9 +2037,10 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
         row_metadata,
         header_name,
         highlighted_col_idx,
-        all_model_data,
+        summary_metrics_lookup,
         equity_to_strategy,
         strategy_color,
+        static_key,
     )
 
     st.divider()
@@ -1856,4 +2048,4 @@ def render_allocation_tab(strategy_name: str, cleaned_data: pl.LazyFrame) -> Non
     # ============================================================================
     # STEP 5: Render collapse SMAs toggle
     # ============================================================================
-    _render_collapse_toggle(all_model_data, strategy_name)
+    _render_collapse_toggle(has_collapsible_smas)
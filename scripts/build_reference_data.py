@@ -0,0 +1,33 @@
+"""Build Arrow IPC copies of the static reference tables.
+
+The CSV files in app_pages/data/ remain the editable source of truth, and the
+.arrow files are not committed. The pages rebuild a missing or stale copy on
+first load (utils.data.load_reference_table); run this script at deploy time to
+prebuild them, e.g. when the deployed checkout is read-only:
+
+    python scripts/build_reference_data.py
+
+Arrow IPC files are memory-mapped on load, skipping CSV parsing and type
+inference entirely.
+"""
+
+from pathlib import Path
+
+import polars as pl
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "app_pages" / "data"
+REFERENCE_TABLES: list[str] = ["abbreviations", "tlh", "equivalents"]
+
+
+def build_reference_data() -> None:
+    """Convert each reference CSV into an uncompressed Arrow IPC file."""
+    for table_name in REFERENCE_TABLES:
+        csv_path = DATA_DIR / f"{table_name}.csv"
+        arrow_path = DATA_DIR / f"{table_name}.arrow"
+        # Uncompressed so the file can be memory-mapped without decoding
+        pl.read_csv(csv_path).write_ipc(arrow_path, compression="uncompressed")
+        print(f"Wrote {arrow_path.relative_to(DATA_DIR.parent.parent)}")
+
+
+if __name__ == "__main__":
+    build_reference_data()
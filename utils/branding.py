@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 # =============================================================================
 # PRIMARY PALETTE
 # =============================================================================
@@ -166,8 +168,9 @@ FONTS: dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=128)
 def hex_to_rgba(hex_color: str, alpha: float) -> str:
-    """Convert hex color to RGBA string."""
+    """Convert hex color to RGBA string (memoized; the palette is small)."""
     h: str = hex_color.lstrip("#")
     r: int = int(h[0:2], 16)
     g: int = int(h[2:4], 16)
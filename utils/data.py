@@ -1,7 +1,9 @@
 """Data processing utilities for Polars."""
 
 import logging
+import os
 import time
+from pathlib import Path
 from typing import Any
 
 import polars as pl
@@ -357,3 +359,43 @@ def get_strategy_by_name(
         return None
 
     return strategy_row.row(0, named=True)
+
+
+# Static reference tables shipped with the app (CSV is the source of truth)
+REFERENCE_DATA_DIR = Path("app_pages/data")
+
+
+def load_reference_table(table_name: str) -> pl.DataFrame:
+    """Load a static reference table, preferring its Arrow IPC copy.
+
+    The CSV in app_pages/data/ is the source of truth. Its .arrow copy is
+    only read when it exists and is at least as new as the CSV; otherwise the
+    CSV is read and the copy is rebuilt, so an edited CSV is never shadowed
+    by a stale binary. The .arrow files are generated, not committed.
+
+    Args:
+        table_name: Reference table name (CSV file stem)
+
+    Returns:
+        Reference table DataFrame
+    """
+    csv_path = REFERENCE_DATA_DIR / f"{table_name}.csv"
+    arrow_path = csv_path.with_suffix(".arrow")
+
+    try:
+        if arrow_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            return pl.read_ipc(arrow_path)
+    except FileNotFoundError:
+        pass
+
+    df = pl.read_csv(csv_path)
+    try:
+        # Write to a temp file and swap it in, so readers never see a partial file
+        tmp_path = arrow_path.with_suffix(".arrow.tmp")
+        df.write_ipc(tmp_path, compression="uncompressed")
+        os.replace(tmp_path, arrow_path)
+        logger.info(f"Rebuilt reference table: {arrow_path}")
+    except OSError as e:
+        # Read-only deployments keep serving the CSV
+        logger.warning(f"Could not write {arrow_path}: {e}")
+    return df